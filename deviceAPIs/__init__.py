@@ -1,3 +1,5 @@
 from .laser import Laser
 from .spectrometer import Spectrometer
 from .stage import Stage
+from .autofocus import AutoFocus
+from .mosaic import Mosaic
@@ -0,0 +1,182 @@
+import math
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+TAG = "autofocus"
+
+GOLDEN_RATIO = (math.sqrt(5) - 1) / 2
+
+
+class AutoFocus(QObject):
+    progressSignal = Signal(float, float)  # 측정한 위치, 선명도
+    focusedSignal = Signal(float, float)  # 초점 위치, 선명도
+    errorSignal = Signal(str)
+
+    def __init__(self, stage, camera, stageIdx=0, cameraIdx=0):
+        """
+
+        :param stage: deviceAPIs.v2.Stage
+        :param camera: deviceAPIs.camera.Camera
+        :param stageIdx: 초점(Z)축 스테이지 번호
+        :param cameraIdx: 선명도를 측정할 카메라 번호
+        """
+        super().__init__()
+        self.stage = stage
+        self.camera = camera
+        self.stageIdx = stageIdx
+        self.cameraIdx = cameraIdx
+
+        self.settleTime = 0.05
+        self.framesPerPoint = 2
+        self.positionTolerance = 1e-6
+        self.timeout = 5000
+
+        self.isRunning = False
+        self.results = {}  # 위치: 선명도
+        self._search = None
+        self._position = None
+        self._settledAt = None
+        self._scores = []
+        self._previousMeter = None  # 시작 전에 켜져 있던 선명도 측정, 종료 시 되돌립니다.
+
+        self.timeoutTimer = QTimer()
+        self.timeoutTimer.setSingleShot(True)
+        self.timeoutTimer.timeout.connect(self.onTimeout)
+
+    def start(self, bottom, top, coarseSteps=9, tolerance=2e-6, settleTime=0.05, framesPerPoint=2,
+              roi=None, step=2, positionTolerance=1e-6):
+        """
+        bottom ~ top 구간을 coarseSteps 간격으로 훑은 뒤, 가장 선명한 지점 주변을 황금분할 탐색으로 좁힙니다.
+
+        :param bottom: 탐색 구간 하단 (m)
+        :param top: 탐색 구간 상단 (m)
+        :param coarseSteps: 1차 탐색 지점 수
+        :param tolerance: 2차 탐색을 끝낼 구간 폭 (m)
+        :param settleTime: 스테이지 이동 완료 후 진동이 잦아들 때까지 기다릴 시간 (초)
+        :param framesPerPoint: 한 지점에서 평균낼 프레임 수
+        :param roi: 선명도를 측정할 영역 (x, y, width, height), None 이면 전체
+        :param step: 선명도 측정 시 픽셀 간격
+        :param positionTolerance: 이동 완료 보고를 요청한 위치의 도착으로 인정할 오차 (m)
+        """
+        if self.isRunning:
+            return
+        self.settleTime = settleTime
+        self.framesPerPoint = framesPerPoint
+        self.positionTolerance = positionTolerance
+        self.results = {}
+        self.isRunning = True
+
+        cameraUnit = self.camera.using_cameras[self.cameraIdx]
+        self._previousMeter = cameraUnit.focus_meter if cameraUnit is not None else None
+        self.camera.set_focus_metric(self.cameraIdx, True, roi=roi, step=step)
+        self.camera.signal_focus.connect(self.onFocus)
+        self.stage.movedSignal.connect(self.onMoved)
+
+        self._search = self.search(bottom, top, max(coarseSteps, 3), tolerance)
+        self.advance(next(self._search))
+
+    def stop(self):
+        if not self.isRunning:
+            return
+        self.isRunning = False
+        self.timeoutTimer.stop()
+        self._search = None
+        self.camera.signal_focus.disconnect(self.onFocus)
+        self.stage.movedSignal.disconnect(self.onMoved)
+        # 다른 곳에서 켜 둔 선명도 측정은 끄지 않고 원래 설정으로 되돌립니다.
+        meter, self._previousMeter = self._previousMeter, None
+        if meter is None:
+            self.camera.set_focus_metric(self.cameraIdx, False)
+        else:
+            self.camera.set_focus_metric(self.cameraIdx, True, meter.method, meter.roi, meter.step)
+
+    def search(self, bottom, top, coarseSteps, tolerance):
+        """
+        측정할 위치를 내보내고 그 위치의 선명도를 돌려받는 제너레이터입니다.
+        마지막으로 (초점 위치, 선명도) 튜플을 내보냅니다.
+        """
+        interval = (top - bottom) / (coarseSteps - 1)
+        positions = [bottom + interval * i for i in range(coarseSteps)]
+        scores = []
+        for position in positions:
+            scores.append((yield position))
+
+        best = max(range(coarseSteps), key=lambda i: scores[i])
+        low = positions[max(best - 1, 0)]
+        high = positions[min(best + 1, coarseSteps - 1)]
+
+        # 황금분할 탐색: 매 단계 한 지점만 새로 측정합니다.
+        x1 = high - GOLDEN_RATIO * (high - low)
+        x2 = low + GOLDEN_RATIO * (high - low)
+        f1 = yield x1
+        f2 = yield x2
+        while high - low > tolerance:
+            if f1 > f2:
+                high, x2, f2 = x2, x1, f1
+                x1 = high - GOLDEN_RATIO * (high - low)
+                f1 = yield x1
+            else:
+                low, x1, f1 = x1, x2, f2
+                x2 = low + GOLDEN_RATIO * (high - low)
+                f2 = yield x2
+
+        position = max(self.results, key=self.results.get)
+        yield position, self.results[position]
+
+    def advance(self, request):
+        if isinstance(request, tuple):
+            position, score = request
+            # 가장 선명했던 위치로 돌아간 뒤 종료합니다.
+            self._search = None
+            self._position = None
+            self.stage.move(self.stageIdx, position)
+            print(f"{TAG} focused: {position}, score: {score}")
+            self.stop()
+            self.focusedSignal.emit(position, score)
+            return
+
+        self._position = request
+        self._settledAt = None
+        self._scores = []
+        if request in self.results:
+            self.record(self.results[request])
+            return
+        self.timeoutTimer.start(self.timeout)
+        self.stage.move(self.stageIdx, request)
+
+    def record(self, score):
+        self.results[self._position] = score
+        self.progressSignal.emit(self._position, score)
+        try:
+            self.advance(self._search.send(score))
+        except StopIteration:
+            self.stop()
+
+    @Slot(int, float)
+    def onMoved(self, idx, position):
+        if idx != self.stageIdx or self._position is None or self._settledAt is not None:
+            return
+        # 이전 이동이나 다른 곳에서 요청한 이동의 완료 보고는 무시합니다.
+        if abs(position - self._position) > self.positionTolerance:
+            return
+        # 이동 완료 보고 이후 settleTime 이 지나서 촬영된 프레임만 측정에 사용합니다.
+        self._settledAt = time.monotonic() + self.settleTime
+
+    @Slot(int, float, float)
+    def onFocus(self, idx, timestamp, score):
+        if idx != self.cameraIdx or self._settledAt is None or timestamp < self._settledAt:
+            return
+        self._scores.append(score)
+        if len(self._scores) < self.framesPerPoint:
+            return
+        self.timeoutTimer.stop()
+        self._settledAt = None
+        self.record(sum(self._scores) / len(self._scores))
+
+    @Slot()
+    def onTimeout(self):
+        msg = f"{TAG} 위치 {self._position} 에서 선명도를 측정하지 못했습니다."
+        print(msg)
+        self.stop()
+        self.errorSignal.emit(msg)
@@ -0,0 +1,82 @@
+import sys
+from typing import NamedTuple, Optional
+
+from deviceAPIs.camera import toupcam
+
+
+class AcquisitionProfile(NamedTuple):
+    """
+    SDK threading and buffering settings applied before streaming starts.
+    None puts back the value the camera had when it was opened, see ToupcamUnit.sdk_defaults.
+    """
+    name: str
+    realtime: Optional[int] = None  # put_RealTime: 0 = queue every frame, 1 = newest frame only, 2 = drop oldest when full
+    frame_deque_length: Optional[int] = None  # TOUPCAM_OPTION_FRAME_DEQUE_LENGTH, [2, 1024]
+    backend_deque_length: Optional[int] = None  # TOUPCAM_OPTION_BACKEND_DEQUE_LENGTH, [2, 1024]
+    callback_thread: Optional[int] = None  # TOUPCAM_OPTION_CALLBACK_THREAD: 1 = run the callback on a dedicated thread
+    multithread: Optional[int] = None  # TOUPCAM_OPTION_MULTITHREAD: 1 = multithread image processing
+    thread_priority: Optional[int] = None  # TOUPCAM_OPTION_THREAD_PRIORITY, Windows: 0 = normal ~ 3 = time critical
+
+    # (field, option) pairs applied through put_Option / get_Option
+    OPTIONS = (
+        ("frame_deque_length", toupcam.TOUPCAM_OPTION_FRAME_DEQUE_LENGTH),
+        ("backend_deque_length", toupcam.TOUPCAM_OPTION_BACKEND_DEQUE_LENGTH),
+        ("callback_thread", toupcam.TOUPCAM_OPTION_CALLBACK_THREAD),
+        ("multithread", toupcam.TOUPCAM_OPTION_MULTITHREAD),
+        ("thread_priority", toupcam.TOUPCAM_OPTION_THREAD_PRIORITY),
+    )
+
+    def apply(self, cam, defaults=None):
+        """
+        apply the profile to an opened, stopped Toupcam and return the effective profile read back from it.
+        fields left None take their value from defaults, so a previous profile does not linger
+        """
+        realtime = self.realtime if self.realtime is not None or defaults is None else defaults.realtime
+        if realtime is not None:
+            try:
+                cam.put_RealTime(realtime)
+            except toupcam.HRESULTException as e:
+                print(f"{self.name}: camera rejected realtime={realtime}: {e}")
+        for field, option in self.OPTIONS:
+            value = getattr(self, field)
+            if value is None and defaults is not None:
+                value = getattr(defaults, field)
+            if value is None:
+                continue
+            try:
+                cam.put_Option(option, value)
+            except toupcam.HRESULTException as e:
+                print(f"{self.name}: camera rejected {field}={value}: {e}")
+        return self.read(cam)
+
+    @classmethod
+    def read(cls, cam):
+        values = {}
+        try:
+            values["realtime"] = cam.get_RealTime()
+        except toupcam.HRESULTException:
+            values["realtime"] = None
+        for field, option in cls.OPTIONS:
+            try:
+                values[field] = cam.get_Option(option)
+            except toupcam.HRESULTException:
+                values[field] = None
+        return cls("effective", **values)
+
+
+# Linux and macOS expect a pthread policy and priority, so the thread priority is only tuned on Windows
+_WIN32 = sys.platform == "win32"
+
+AcquisitionProfile.DEFAULT = AcquisitionProfile("default")
+# newest frame as soon as possible: shallow queues, pending frames are dropped
+AcquisitionProfile.LOW_LATENCY = AcquisitionProfile(
+    "low latency", realtime=1, frame_deque_length=2, backend_deque_length=2,
+    callback_thread=1, multithread=1, thread_priority=2 if _WIN32 else None)
+# never lose a frame: deep queues and parallel image processing
+AcquisitionProfile.MAX_THROUGHPUT = AcquisitionProfile(
+    "max throughput", realtime=0, frame_deque_length=16, backend_deque_length=16,
+    callback_thread=1, multithread=1, thread_priority=1 if _WIN32 else None)
+# fewest threads and wakeups, for idle previews and shared machines
+AcquisitionProfile.LOW_CPU = AcquisitionProfile(
+    "low cpu", realtime=2, frame_deque_length=2, backend_deque_length=2,
+    callback_thread=0, multithread=0, thread_priority=0 if _WIN32 else None)
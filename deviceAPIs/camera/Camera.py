@@ -1,29 +1,62 @@
 import numpy as np
 from PySide6.QtCore import QObject, Signal, Slot
-from deviceAPIs.camera import toupcam
+from deviceAPIs.camera.CameraDiscovery import CameraDiscovery
 from deviceAPIs.camera.CameraUnit import ToupcamUnit, CVUnit
+from deviceAPIs.camera.Demosaic import Demosaicer
+from deviceAPIs.camera.FocusMetric import FocusMethod
+from deviceAPIs.camera.FrameAccumulator import FrameAccumulator
+from deviceAPIs.camera.FrameAnalyzer import FrameAnalyzer
+from deviceAPIs.camera.FrameMailbox import FrameMailbox, DropPolicy
+from deviceAPIs.camera.FrameRecorder import FrameRecorder, RecordFormat
+from deviceAPIs.camera.PixelFormat import to_8bit
+from deviceAPIs.camera.Preview import Previewer
+from deviceAPIs.camera.SharedFrameRing import SharedFramePublisher
+from deviceAPIs.camera.VideoRecorder import VideoRecorder
 import cv2 as cv2
 
 
 class Camera(QObject):
     signal_image = Signal(int, np.ndarray)
+    signal_frame = Signal(int, object)  # Frame with the image and its metadata
+    signal_preview = Signal(int, np.ndarray)  # downsampled 8-bit display stream, see enable_preview
+    signal_analysis = Signal(int, int, object)  # camera idx, frame seq, analysis result
+    signal_accumulated = Signal(int, int, object, object)  # camera idx, number of frames, mean, std or None
+    signal_focus = Signal(int, float, float)  # camera idx, host timestamp of the frame, sharpness score
     exception = Signal(str)
 
     using_cameras = []
+    discovery = None  # shared by every Camera, the Toupcam hot-plug callback is process-wide
 
-    def __init__(self):
+    def __init__(self, mailbox_depth=1, drop_policy=DropPolicy.DROP_OLDEST):
+        """
+
+        :param mailbox_depth: number of frames a camera may queue for a slow consumer
+        :param drop_policy: DropPolicy applied when the mailbox is full
+        """
         super().__init__()
+        self.mailbox_depth = mailbox_depth
+        self.drop_policy = drop_policy
+        self.demosaicers = {}
+        self.publishers = {}
+        self.analyzers = {}
+        self.recorders = {}
+        self.video_recorders = {}
+        self.previewers = {}
+        self.accumulators = {}
+        if Camera.discovery is None:
+            # the OpenCV ports are probed on the first get_cvcam_list() or refresh_camera_list(), not here
+            Camera.discovery = CameraDiscovery()
 
     def get_toupcam_list(self):
         toupcam_units = []
 
-        toupcams = toupcam.Toupcam.EnumV2()
+        toupcams = self.discovery.get_toupcams()
         for cam in toupcams:
             camera_available = True
             toupcam_unit = ToupcamUnit(cam.displayname, cam.id, cam.model)
 
             for using_camera in self.using_cameras:
-                if using_camera.is_same(toupcam_unit):
+                if using_camera is not None and using_camera.is_same(toupcam_unit):
                     print("is using")
                     camera_available = False
                     break
@@ -35,37 +68,24 @@ class Camera(QObject):
 
     def get_cvcam_list(self):
         cvcam_units = []
-        non_working_ports = 0
-        dev_port = 0
-        while non_working_ports < 4:  # if there are more than 3 non working ports stop the testing.
-            camera = cv2.VideoCapture(dev_port)
-
-            if not camera.isOpened():
-                non_working_ports += 1
-                dev_port += 1
-                continue
-            is_reading, img = camera.read()
-            if not is_reading:
-                non_working_ports += 1
-                dev_port += 1
-                continue
+        for dev_port in self.discovery.get_cv_ports():
             camera_available = True
             cvcam_unit = CVUnit(cam_id=dev_port)
 
             for using_camera in self.using_cameras:
-                if using_camera.is_same(cvcam_unit):
+                if using_camera is not None and using_camera.is_same(cvcam_unit):
                     print("is using")
                     camera_available = False
                     break
-            if not camera_available:
-                non_working_ports += 1
-                dev_port += 1
-                continue
-
-            cvcam_units.append(cvcam_unit)
-            dev_port += 1
+            if camera_available:
+                cvcam_units.append(cvcam_unit)
         return cvcam_units
 
+    def refresh_camera_list(self):
+        """drop the cached discovery results, e.g. after plugging in a webcam"""
+        self.discovery.invalidate()
+        self.discovery.prefetch()
+
     def get_available_camera_list(self):
         toupcam_units = self.get_toupcam_list()
         cvcam_units = self.get_cvcam_list()
@@ -73,25 +93,235 @@ class Camera(QObject):
 
         return camera_units
 
-    def connect_to_camera(self, camera_unit):
+    def connect_to_camera(self, camera_unit, mailbox_depth=None, drop_policy=None):
         if camera_unit in self.using_cameras:
             print("this camera is using")
             return
 
         idx = len(self.using_cameras)
+        camera_unit.mailbox = FrameMailbox(
+            self.mailbox_depth if mailbox_depth is None else mailbox_depth,
+            self.drop_policy if drop_policy is None else drop_policy,
+        )
         self.using_cameras.append(camera_unit)
+        self.using_cameras[idx].signal_frame_ready.connect(lambda: self.on_frame_ready(idx))
+        self.using_cameras[idx].signal_focus.connect(lambda timestamp, score: self.signal_focus.emit(idx, timestamp, score))
         self.using_cameras[idx].connect_to_camera()
-        self.using_cameras[idx].signal_image.connect(lambda image: self.on_image_signal(idx, image))
 
     def disconnect_to_camera(self, idx):
         if self.using_cameras[idx] is None:
             print("{idx} camera is already closed")
             return
 
-        self.using_cameras[idx].signal_image.disconnect()
+        self.set_demosaic(idx, False)
+        self.disable_preview(idx)
+        self.disable_accumulator(idx)
+        self.stop_recording(idx)
+        self.stop_video_recording(idx)
+        for analyzer in list(self.analyzers.get(idx, ())):
+            self.remove_analysis(idx, analyzer)
+        self.disable_shared_memory(idx)
+        self.using_cameras[idx].signal_frame_ready.disconnect()
+        self.using_cameras[idx].set_focus_metric(False)
+        self.using_cameras[idx].signal_focus.disconnect()
+        self.using_cameras[idx].mailbox.close()
         self.using_cameras[idx].close()
         self.using_cameras[idx] = None
+        # a port that was busy while it was probed has to be probed again
+        self.discovery.invalidate()
+
+    def get_dropped_frames(self, idx):
+        camera_unit = self.using_cameras[idx]
+        if camera_unit is None:
+            return 0
+        return camera_unit.mailbox.dropped
+
+    def set_demosaic(self, idx, enabled, max_workers=2):
+        """
+        demosaic raw Bayer frames of camera idx on a worker pool before they are emitted on signal_image.
+        signal_frame keeps delivering every raw frame.
+        """
+        demosaicer = self.demosaicers.pop(idx, None)
+        if demosaicer is not None:
+            demosaicer.signal_image.disconnect()
+            demosaicer.close()
+        if enabled:
+            demosaicer = Demosaicer(max_workers=max_workers, max_pending=max_workers)
+            demosaicer.signal_image.connect(lambda frame: self.emit_image(idx, frame))
+            demosaicer.exception.connect(self.exception)
+            self.demosaicers[idx] = demosaicer
+
+    def enable_preview(self, idx, width, height, fps=30.0, interpolation=cv2.INTER_AREA):
+        """
+        emit frames of camera idx on signal_preview, downsampled to fit width x height and at most fps per second.
+        interpolation=None uses stride slicing. signal_image and signal_frame keep the full resolution stream.
+        calling it again while the preview runs updates its size, fps and interpolation.
+        """
+        camera_unit = self.using_cameras[idx]
+        if camera_unit is None:
+            return None
+        previewer = self.previewers.get(idx)
+        if previewer is not None:
+            previewer.set_size(width, height)
+            previewer.set_fps(fps)
+            previewer.set_interpolation(interpolation)
+            return previewer
+        previewer = Previewer(width, height, fps, interpolation)
+        previewer.signal_image.connect(lambda image: self.signal_preview.emit(idx, image))
+        previewer.exception.connect(self.exception)
+        camera_unit.add_sink(previewer)
+        self.previewers[idx] = previewer
+        return previewer
+
+    def disable_preview(self, idx):
+        previewer = self.previewers.pop(idx, None)
+        if previewer is None:
+            return
+        if self.using_cameras[idx] is not None:
+            self.using_cameras[idx].remove_sink(previewer)
+        previewer.signal_image.disconnect()
+
+    def enable_accumulator(self, idx, every=16, std=False, reset=True):
+        """
+        average frames of camera idx into float32 buffers and emit the mean (and std) every `every` frames
+        on signal_accumulated. the returned FrameAccumulator also computes the result on demand.
+        """
+        camera_unit = self.using_cameras[idx]
+        if camera_unit is None or idx in self.accumulators:
+            return None
+        accumulator = FrameAccumulator(every, std, reset)
+        accumulator.signal_result.connect(lambda count, mean, std_: self.signal_accumulated.emit(idx, count, mean, std_))
+        accumulator.exception.connect(self.exception)
+        camera_unit.add_sink(accumulator)
+        self.accumulators[idx] = accumulator
+        return accumulator
+
+    def disable_accumulator(self, idx):
+        accumulator = self.accumulators.pop(idx, None)
+        if accumulator is None:
+            return
+        if self.using_cameras[idx] is not None:
+            self.using_cameras[idx].remove_sink(accumulator)
+        accumulator.close(wait=False)
+        accumulator.signal_result.disconnect()
+
+    def set_focus_metric(self, idx, enabled, method=FocusMethod.LAPLACIAN, roi=None, step=2):
+        """emit a sharpness score for every frame of camera idx on signal_focus, see CameraUnit.set_focus_metric"""
+        camera_unit = self.using_cameras[idx]
+        if camera_unit is not None:
+            camera_unit.set_focus_metric(enabled, method, roi, step)
+
+    def enable_shared_memory(self, idx, slots=4):
+        """
+        copy every frame of camera idx into a shared-memory ring that other processes read with
+        SharedFrameReader(publisher.name) once the first frame has arrived.
+        frames in the ring are numbered by the ring, not by the camera.
+        """
+        camera_unit = self.using_cameras[idx]
+        if camera_unit is None:
+            return None
+        if idx in self.publishers:
+            return self.publishers[idx]
+        publisher = SharedFramePublisher(idx, slots)
+        camera_unit.add_sink(publisher)
+        self.publishers[idx] = publisher
+        return publisher
+
+    def disable_shared_memory(self, idx):
+        publisher = self.publishers.pop(idx, None)
+        if publisher is None:
+            return
+        if self.using_cameras[idx] is not None:
+            self.using_cameras[idx].remove_sink(publisher)
+        publisher.close()
+
+    def add_analysis(self, idx, func, max_workers=2):
+        """
+        run func(image) on frames of camera idx in a process pool and emit the results on signal_analysis.
+        frames are skipped while the pool is busy. enable_shared_memory() first to hand frames to the
+        workers through shared memory instead of pickling them.
+        """
+        camera_unit = self.using_cameras[idx]
+        if camera_unit is None:
+            return None
+        analyzer = FrameAnalyzer(func, max_workers=max_workers, publisher=self.publishers.get(idx))
+        analyzer.signal_result.connect(lambda seq, result: self.signal_analysis.emit(idx, seq, result))
+        analyzer.exception.connect(self.exception)
+        camera_unit.add_sink(analyzer)
+        self.analyzers.setdefault(idx, []).append(analyzer)
+        return analyzer
+
+    def remove_analysis(self, idx, analyzer):
+        analyzers = self.analyzers.get(idx, [])
+        if analyzer not in analyzers:
+            return
+        analyzers.remove(analyzer)
+        if self.using_cameras[idx] is not None:
+            self.using_cameras[idx].remove_sink(analyzer)
+        analyzer.signal_result.disconnect()
+        analyzer.close()
+
+    def start_recording(self, idx, path, record_format=RecordFormat.MEMMAP, max_frames=1000, chunk_frames=64,
+                        max_backlog_bytes=1 << 30):
+        """
+        record every frame of camera idx under path (without extension) until stop_recording(idx).
+        the returned FrameRecorder reports its queue on signal_backlog; frames arriving while
+        max_backlog_bytes are waiting for the disk are dropped and counted in FrameRecorder.dropped.
+        """
+        camera_unit = self.using_cameras[idx]
+        if camera_unit is None or idx in self.recorders:
+            return None
+        recorder = FrameRecorder(path, record_format, max_frames, chunk_frames, max_backlog_bytes)
+        recorder.exception.connect(self.exception)
+        camera_unit.add_sink(recorder)
+        self.recorders[idx] = recorder
+        return recorder
+
+    def stop_recording(self, idx, wait=True):
+        recorder = self.recorders.pop(idx, None)
+        if recorder is None:
+            return
+        if self.using_cameras[idx] is not None:
+            self.using_cameras[idx].remove_sink(recorder)
+        recorder.close(wait)
+
+    def start_video_recording(self, idx, path, fps=30.0, fourcc="mp4v", max_queue=16):
+        """
+        encode the frames of camera idx into the video file path until stop_video_recording(idx).
+        frames the encoder cannot keep up with are dropped and counted in VideoRecorder.dropped.
+        """
+        camera_unit = self.using_cameras[idx]
+        if camera_unit is None or idx in self.video_recorders:
+            return None
+        # Toupcam frames are RGB, OpenCV captures are already BGR
+        recorder = VideoRecorder(path, fps, fourcc, rgb=isinstance(camera_unit, ToupcamUnit), max_queue=max_queue)
+        recorder.exception.connect(self.exception)
+        camera_unit.add_sink(recorder)
+        self.video_recorders[idx] = recorder
+        return recorder
+
+    def stop_video_recording(self, idx, wait=True):
+        recorder = self.video_recorders.pop(idx, None)
+        if recorder is None:
+            return
+        if self.using_cameras[idx] is not None:
+            self.using_cameras[idx].remove_sink(recorder)
+        recorder.close(wait)
+
+    @Slot(int)
+    def on_frame_ready(self, idx):
+        camera_unit = self.using_cameras[idx]
+        if camera_unit is None:
+            return
+        demosaicer = self.demosaicers.get(idx)
+        for frame in camera_unit.mailbox.take_all():
+            self.signal_frame.emit(idx, frame)
+            if frame.bayer is not None and demosaicer is not None:
+                demosaicer.submit(frame)
+            else:
+                self.emit_image(idx, frame)
 
-    @Slot(int, np.ndarray)
-    def on_image_signal(self, idx, image):
-        self.signal_image.emit(idx, image)
+    def emit_image(self, idx, frame):
+        # signal_image is the display stream: high bit-depth frames are reduced to 8 bits here,
+        # signal_frame keeps the full dynamic range
+        self.signal_image.emit(idx, to_8bit(frame.image, frame.bits))
@@ -0,0 +1,89 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from deviceAPIs.camera import toupcam
+
+
+class CameraDiscovery:
+    """
+    Cached camera enumeration.
+
+    OpenCV ports are probed concurrently and Toupcam devices are enumerated once; the results are
+    kept until a Toupcam hot-plug event (macOS, Linux) or until they are older than ttl seconds.
+    """
+
+    def __init__(self, ttl=30.0, max_cv_ports=8, max_workers=8):
+        self.ttl = ttl
+        self.max_cv_ports = max_cv_ports
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="camera-probe")
+        # the refresh task waits on the probes, so it gets its own thread to never starve the pool
+        self._refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="camera-discovery")
+        self._lock = threading.Lock()
+        self._toupcams = None
+        self._toupcams_time = 0.0
+        self._cv_future = None
+        self._cv_time = 0.0
+
+        self.hotplug = False
+        if sys.platform != "win32":
+            try:
+                toupcam.Toupcam.HotPlug(self.invalidate)
+                self.hotplug = True
+            except (toupcam.HRESULTException, OSError) as e:
+                print(f"toupcam hot-plug is not available: {e}")
+
+    def invalidate(self):
+        with self._lock:
+            self._toupcams = None
+            self._cv_future = None
+
+    def _is_fresh(self, timestamp):
+        return time.monotonic() - timestamp < self.ttl
+
+    def get_toupcams(self):
+        with self._lock:
+            # with hot-plug notifications the cache is only dropped when a device comes or goes
+            if self._toupcams is not None and (self.hotplug or self._is_fresh(self._toupcams_time)):
+                return self._toupcams
+        toupcams = toupcam.Toupcam.EnumV2()
+        with self._lock:
+            self._toupcams = toupcams
+            self._toupcams_time = time.monotonic()
+        return toupcams
+
+    def prefetch(self):
+        """start probing the OpenCV ports in the background so the next get_cv_ports() returns at once"""
+        with self._lock:
+            if self._cv_future is None or (self._cv_future.done() and not self._is_fresh(self._cv_time)):
+                self._cv_future = self._refresh_executor.submit(self._probe_cv_ports)
+                self._cv_time = time.monotonic()
+            return self._cv_future
+
+    def get_cv_ports(self):
+        return self.prefetch().result()
+
+    def _probe_cv_ports(self):
+        results = self._executor.map(self.probe_cv_port, range(self.max_cv_ports))
+        return [port for port, working in zip(range(self.max_cv_ports), results) if working]
+
+    @staticmethod
+    def probe_cv_port(port):
+        camera = cv2.VideoCapture(port)
+        try:
+            if not camera.isOpened():
+                return False
+            is_reading, _ = camera.read()
+            return is_reading
+        finally:
+            camera.release()
+
+    def close(self):
+        if self.hotplug:
+            toupcam.Toupcam.HotPlug(None)
+        self._refresh_executor.shutdown(wait=False, cancel_futures=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
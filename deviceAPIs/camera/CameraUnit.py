@@ -1,4 +1,7 @@
+import os
 import sys
+import threading
+import time
 
 import cv2
 import numpy as np
@@ -6,6 +9,15 @@ import numpy as np
 from PySide6.QtCore import QObject, Signal, Slot, Qt, QThread
 
 from deviceAPIs.camera import toupcam
+from deviceAPIs.camera.AcquisitionProfile import AcquisitionProfile
+from deviceAPIs.camera.Demosaic import BAYER_PATTERNS, fourcc_to_str
+from deviceAPIs.camera.FlatField import FlatFieldCorrection, calibration_path
+from deviceAPIs.camera.FocusMetric import FocusMeter, FocusMethod
+from deviceAPIs.camera.FrameAccumulator import FrameAccumulator
+from deviceAPIs.camera.Frame import Frame
+from deviceAPIs.camera.FrameMailbox import FrameMailbox
+from deviceAPIs.camera.FramePool import FramePool
+from deviceAPIs.camera.PixelFormat import PixelFormat
 
 # MAX_RESOLUTION = [10240, 4320]
 
@@ -26,7 +38,9 @@ class CamType:
 
 
 class CameraUnit(QThread):
-    signal_image = Signal(np.ndarray)
+    signal_frame_ready = Signal()  # the mailbox went from empty to non-empty
+    signal_focus = Signal(float, float)  # host timestamp of the frame, sharpness score
+    signal_reference = Signal(object)  # mean of the frames of capture_reference(), None on timeout
     exception = Signal(str)
 
     def __init__(self, name=None, cam_id=None, model=None):
@@ -36,27 +50,173 @@ class CameraUnit(QThread):
         self.cam_id = cam_id
         self.model = model
         self.cam = None
-        self.buf = None  # video buffer
+        self.pool = None  # video frame buffers
         self.width = 0  # video width
         self.height = 0  # video height
+        self.mailbox = FrameMailbox()
+        self.latest_frame = None  # most recent frame, for consumers polling at their own rate
+        self.latest_requested = threading.Event()
+        self.sinks = ()  # callables fed every frame on the acquisition thread, replaced as a whole
+        self.correction = None  # FlatFieldCorrection applied in place before the frame is published
+        self.focus_meter = None
+        self._reference = None  # (sink, timeout timer, correction to restore) of a running capture_reference
+        self._reference_lock = threading.Lock()
 
     def run(self):
         pass
 
+    def publish_frame(self, frame):
+        correction = self.correction
+        if correction is not None and correction.shape == frame.image.shape:
+            if frame.image.flags.writeable:
+                correction.apply(frame.image, frame.bits, out=frame.image)
+            else:
+                frame = frame._replace(image=correction.apply(frame.image, frame.bits))
+        self.latest_frame = frame
+        self.latest_requested.clear()
+        for sink in self.sinks:
+            try:
+                sink(frame)
+            except Exception as e:
+                self.exception.emit(f"frame sink {sink} failed: {e}")
+        if self.mailbox.put(frame):
+            self.signal_frame_ready.emit()
+
+    def add_sink(self, sink):
+        """
+        sink(frame) runs on the acquisition thread for every frame, before the mailbox can drop it,
+        so it must only hand the frame over (copy, enqueue) and return quickly
+        """
+        self.sinks = self.sinks + (sink,)
+
+    def remove_sink(self, sink):
+        self.sinks = tuple(s for s in self.sinks if s is not sink)
+
+    def capture_reference(self, count=16, timeout=10.0):
+        """
+        average the next count uncorrected frames, e.g. with the shutter closed for a dark reference
+        or on a uniform bright field for a flat one. returns at once, the mean is emitted on
+        signal_reference (None if the frames did not arrive within timeout seconds).
+        returns False if a capture is already running
+        """
+        with self._reference_lock:
+            if self._reference is not None:
+                return False
+            accumulator = FrameAccumulator(every=0)
+
+            def sink(frame):
+                if accumulator.count < count:
+                    accumulator.add(frame.image)
+                    if accumulator.count >= count:
+                        self._finish_reference(sink, accumulator.compute()[1])
+
+            timer = threading.Timer(timeout, lambda: self._finish_reference(sink, None, accumulator.count, count))
+            timer.daemon = True
+            self._reference = (sink, timer, self.correction)
+            self.correction = None
+        self.add_sink(sink)
+        timer.start()
+        return True
+
+    def _finish_reference(self, sink, mean, captured=0, count=0):
+        with self._reference_lock:
+            if self._reference is None or self._reference[0] is not sink:
+                return
+            _, timer, correction = self._reference
+            self._reference = None
+        timer.cancel()
+        self.remove_sink(sink)
+        self.correction = correction
+        if mean is None:
+            self.exception.emit(f"captured {captured} of {count} reference frames")
+        self.signal_reference.emit(mean)
+
+    def set_correction(self, correction):
+        """FlatFieldCorrection applied to every frame, None turns the correction off"""
+        self.correction = correction
+
+    def set_focus_metric(self, enabled, method=FocusMethod.LAPLACIAN, roi=None, step=2):
+        """
+        score the sharpness of every frame on roi (x, y, width, height), decimated by step,
+        and emit it on signal_focus
+        """
+        if self.focus_meter is not None:
+            self.remove_sink(self.focus_meter)
+            self.focus_meter.close()
+            self.focus_meter = None
+        if enabled:
+            self.focus_meter = FocusMeter(self.signal_focus.emit, method, roi, step)
+            self.add_sink(self.focus_meter)
+
+    def get_serial(self):
+        return None
+
+    def get_frame_format(self):
+        """(name such as "raw_12bit", shape, dtype) of the frames delivered now, None while unknown"""
+        return None
+
+    def get_calibration_path(self):
+        serial = self.get_serial()
+        frame_format = self.get_frame_format()
+        if serial is None or frame_format is None or not self.width or not self.height:
+            return None
+        return calibration_path(serial, self.width, self.height, frame_format[0])
+
+    def save_correction(self):
+        path = self.get_calibration_path()
+        if self.correction is None or path is None:
+            return False
+        self.correction.save(path, self.get_frame_format()[2])
+        return True
+
+    def load_correction(self):
+        """use the references cached for this camera, resolution and frame format, if any"""
+        path = self.get_calibration_path()
+        if path is None or not os.path.exists(path):
+            return False
+        _, shape, dtype = self.get_frame_format()
+        try:
+            self.correction = FlatFieldCorrection.load(path, shape, dtype)
+        except ValueError as e:
+            self.exception.emit(f"failed to load calibration: {e}")
+            return False
+        return True
+
+    def get_latest_frame(self):
+        """return the most recent frame (or None) and ask the backend to deliver a fresh one"""
+        self.latest_requested.set()
+        return self.latest_frame
+
     def is_same(self, camera_unit):
         pass
 
     def connect_to_camera(self):
         pass
 
-    def close(self, event):
+    def close(self, event=None):
         pass
 
 
 class ToupcamUnit(CameraUnit):
-    def __init__(self, name, cam_id, model):
+    def __init__(self, name, cam_id, model, pool_size=4, pixel_format=PixelFormat.RGB24,
+                 profile=AcquisitionProfile.DEFAULT):
         super().__init__(name, cam_id, model)
         self.type = CamType.TOUPCAM
+        self.pool_size = pool_size
+        self.profile = profile
+        self.effective_profile = None  # the SDK settings read back after the profile was applied
+        self.sdk_defaults = None  # the SDK settings read right after opening, restored for fields a profile leaves None
+        self.pixel_format = pixel_format
+        self.sensor_bits = 8  # significant bits of the sensor readout
+        self.row_pitch = 0  # bytes per row handed to PullImageWithRowPitchV2
+        self.row_bytes = 0  # bytes of pixel data per row
+        self.dropped_frames = 0  # frames discarded because every pool slot was leased
+        self.raw_mode = False
+        self.raw_format = None  # (fourcc, bits per pixel) of the sensor data in raw mode
+        self.frame_shape = None
+        self.frame_dtype = np.dtype(np.uint8)
+        self.frame_bits = 8
+        self.frame_bayer = None
 
     def run(self):
         pass
@@ -71,19 +231,168 @@ class ToupcamUnit(CameraUnit):
         except toupcam.HRESULTException as e:
             self.exception.emit(f"failed to open camera: {e}")
         else:
-            self.width, self.height = self.cam.get_Size()
             print(f"size: {self.cam.get_Size()}")
-            bufsize = ((self.width * 24 + 31) // 32 * 4) * self.height
-            self.buf = bytes(bufsize)
-            print(self.buf.__sizeof__())
+            self.sdk_defaults = AcquisitionProfile.read(self.cam)
             try:
                 if sys.platform == "win32":
                     self.cam.put_Option(toupcam.TOUPCAM_OPTION_BYTEORDER, 0)
-                    self.cam.StartPullModeWithCallback(self.cameraCallback, self)
+                self.cam.put_Option(toupcam.TOUPCAM_OPTION_RAW, 1 if self.raw_mode else 0)
+                self.apply_pixel_format()
+                self.layout_buffers()
+                self.start_streaming()
             except toupcam.HRESULTException as e:
                 self.exception.emit(f"failed to open camera: {e}")
 
-    def close(self, event):
+    def start_streaming(self):
+        # the threading and deque options only take effect before the stream starts
+        self.effective_profile = self.profile.apply(self.cam, self.sdk_defaults)
+        print(f"acquisition profile: {self.effective_profile}")
+        self.cam.StartPullModeWithCallback(self.cameraCallback, self)
+
+    def layout_buffers(self):
+        # the final size already accounts for ROI and binning
+        self.width, self.height = self.cam.get_FinalSize()
+        if self.raw_mode:
+            self.raw_format = self.cam.get_RawFormat()
+            fourcc, self.frame_bits = self.raw_format
+            pattern = fourcc_to_str(fourcc)
+            self.frame_bayer = pattern if pattern in BAYER_PATTERNS else None
+            self.frame_dtype = np.dtype(np.uint8 if self.frame_bits <= 8 else np.uint16)
+            self.frame_shape = (self.height, self.width)
+        else:
+            self.frame_bayer = None
+            self.frame_dtype = PixelFormat.dtype(self.pixel_format)
+            self.frame_bits = self.sensor_bits if PixelFormat.is_16bit(self.pixel_format) else 8
+            if PixelFormat.is_mono(self.pixel_format):
+                self.frame_shape = (self.height, self.width)
+            else:
+                self.frame_shape = (self.height, self.width, 3)
+        self.row_bytes = int(np.prod(self.frame_shape[1:])) * self.frame_dtype.itemsize
+        # rows are pulled without padding so every frame is C-contiguous, pull_image() and
+        # frame_view() also handle a padded row_pitch
+        self.row_pitch = self.row_bytes
+        if self.pool is None or not self.pool.is_compatible((self.height, self.row_pitch), np.uint8):
+            self.pool = FramePool((self.height, self.row_pitch), np.uint8, self.pool_size)
+
+    def reconfigure(self, apply, restore=None):
+        """
+        stop streaming, apply a sensor change, re-layout the frame pool and resume.
+        if the change is rejected, restore() puts the previous settings back and streaming resumes with them
+        """
+        if self.cam is None:
+            return False
+        applied = True
+        try:
+            self.cam.Stop()
+            apply()
+            self.layout_buffers()
+        except toupcam.HRESULTException as e:
+            applied = False
+            self.exception.emit(f"failed to reconfigure camera: {e}")
+            try:
+                if restore is not None:
+                    restore()
+                self.layout_buffers()
+            except toupcam.HRESULTException as e:
+                self.exception.emit(f"failed to restore camera settings: {e}")
+        finally:
+            try:
+                self.start_streaming()
+            except toupcam.HRESULTException as e:
+                self.exception.emit(f"failed to resume streaming: {e}")
+                applied = False
+        return applied
+
+    def get_roi(self):
+        if self.cam is not None:
+            return self.cam.get_Roi()
+
+    def set_roi(self, x, y, width, height):
+        """the SDK needs even values, so they are rounded down; width = height = 0 restores the full frame"""
+        previous = self.cam.get_Roi() if self.cam is not None else None
+        return self.reconfigure(lambda: self.cam.put_Roi(x & ~1, y & ~1, width & ~1, height & ~1),
+                                lambda: self.cam.put_Roi(*previous))
+
+    def get_binning(self):
+        if self.cam is not None:
+            return self.cam.get_Option(toupcam.TOUPCAM_OPTION_BINNING)
+
+    def set_binning(self, n, average=False):
+        """n: 1 (no binning) ~ 8, average: average the binned pixels instead of adding them"""
+        value = n | 0x80 if average and n > 1 else n
+        previous = self.get_binning()
+        return self.reconfigure(lambda: self.cam.put_Option(toupcam.TOUPCAM_OPTION_BINNING, value),
+                                lambda: self.cam.put_Option(toupcam.TOUPCAM_OPTION_BINNING, previous))
+
+    def apply_pixel_format(self):
+        high_bit_depth = PixelFormat.is_16bit(self.pixel_format)
+        self.cam.put_Option(toupcam.TOUPCAM_OPTION_BITDEPTH, 1 if high_bit_depth else 0)
+        self.cam.put_Option(toupcam.TOUPCAM_OPTION_RGB, PixelFormat.rgb_option(self.pixel_format))
+        sensor_format, self.sensor_bits = self.get_sensor_pixel_format(high_bit_depth)
+        try:
+            self.cam.put_Option(toupcam.TOUPCAM_OPTION_PIXEL_FORMAT, sensor_format)
+        except toupcam.HRESULTException:
+            pass  # the sensor has a single readout format
+
+    def get_sensor_pixel_format(self, high_bit_depth):
+        """return (TOUPCAM_PIXELFORMAT_xxx, bits), the deepest readout the model supports when high_bit_depth"""
+        if high_bit_depth and self.model is not None:
+            for flag, pixel_format, bits in (
+                    (toupcam.TOUPCAM_FLAG_RAW16, toupcam.TOUPCAM_PIXELFORMAT_RAW16, 16),
+                    (toupcam.TOUPCAM_FLAG_RAW14, toupcam.TOUPCAM_PIXELFORMAT_RAW14, 14),
+                    (toupcam.TOUPCAM_FLAG_RAW12, toupcam.TOUPCAM_PIXELFORMAT_RAW12, 12),
+                    (toupcam.TOUPCAM_FLAG_RAW10, toupcam.TOUPCAM_PIXELFORMAT_RAW10, 10)):
+                if self.model.flag & flag:
+                    return pixel_format, bits
+        return toupcam.TOUPCAM_PIXELFORMAT_RAW8, 8
+
+    def set_pixel_format(self, pixel_format):
+        """PixelFormat.RGB24, RGB48, MONO8 or MONO16 (mono formats need a monochromatic camera)"""
+        previous = self.pixel_format
+
+        def restore():
+            self.pixel_format = previous
+            self.apply_pixel_format()
+
+        self.pixel_format = pixel_format
+        return self.reconfigure(self.apply_pixel_format, restore)
+
+    def set_profile(self, profile):
+        """
+        apply an AcquisitionProfile, such as AcquisitionProfile.LOW_LATENCY, and return the effective one,
+        or None if the camera could not be restarted with it
+        """
+        previous = self.profile
+        self.profile = profile
+        if not self.reconfigure(lambda: None):
+            # streaming failed to start with the new profile, so the camera is restarted with the previous one
+            self.profile = previous
+            self.reconfigure(lambda: None)
+            return None
+        return self.effective_profile
+
+    def set_raw_mode(self, enabled):
+        """deliver the sensor mosaic (8 ~ 16 bits, see raw_format) instead of SDK-demosaiced RGB24"""
+        previous = self.raw_mode
+
+        def restore():
+            self.raw_mode = previous
+            self.cam.put_Option(toupcam.TOUPCAM_OPTION_RAW, 1 if previous else 0)
+
+        self.raw_mode = enabled
+        return self.reconfigure(lambda: self.cam.put_Option(toupcam.TOUPCAM_OPTION_RAW, 1 if enabled else 0), restore)
+
+    def get_serial(self):
+        if self.cam is not None:
+            return self.cam.SerialNumber()
+
+    def get_frame_format(self):
+        if self.frame_shape is None:
+            return None
+        kind = "raw" if self.raw_mode else PixelFormat.get_name(self.pixel_format).lower()
+        return f"{kind}_{self.frame_bits}bit", self.frame_shape, self.frame_dtype
+
+    def close(self, event=None):
         if self.cam is not None:
             self.cam.Close()
             self.cam = None
@@ -92,13 +401,55 @@ class ToupcamUnit(CameraUnit):
     @staticmethod
     def cameraCallback(nEvent, ctx):
         if nEvent == toupcam.TOUPCAM_EVENT_IMAGE:
+            pool = ctx.pool
+            slot = pool.acquire()
             try:
-                ctx.cam.PullImageV2(ctx.buf, 24, None)
+                if slot is None:
+                    # every buffer is still held by a consumer: discard this frame inside the SDK
+                    ctx.cam.PullImageV2(None, PixelFormat.pull_bits(ctx.pixel_format), None)
+                    ctx.dropped_frames += 1
+                    return
+                info = toupcam.ToupcamFrameInfoV2(0, 0, 0, 0, 0)
+                ctx.pull_image(pool.slot(slot), info)
+                host_timestamp = time.monotonic()
             except toupcam.HRESULTException as e:
+                if slot is not None:
+                    pool.release(slot)
                 ctx.exception.emit(f"pull image failed: {e}")
             else:
-                img_np = np.frombuffer(ctx.buf, dtype=np.uint8).reshape((ctx.height, ctx.width, 3))
-                ctx.signal_image.emit(img_np)
+                # the frame owns its slot until the consumers drop every reference to it
+                img_np = ctx.frame_view(pool.lease(slot))
+                ctx.publish_frame(Frame(img_np, info.timestamp, host_timestamp, info.seq, ctx.get_dropped_frames(),
+                                        ctx.frame_bits, ctx.frame_bayer))
+
+    def pull_image(self, buf, info=None):
+        """
+        pull the pending frame straight into buf, a C-contiguous array of at least height * row_pitch bytes,
+        and return it as a frame shaped view of buf
+        """
+        if buf.nbytes < self.height * self.row_pitch:
+            raise ValueError(f"buffer of {buf.nbytes} bytes cannot hold a {self.height} x {self.row_pitch} bytes frame")
+        self.cam.PullImageToArray(buf, PixelFormat.pull_bits(self.pixel_format), self.row_pitch, info)
+        return self.frame_view(buf)
+
+    def frame_view(self, buf):
+        # rows may be padded past row_bytes, the view strides over the padding without copying
+        rows = buf.reshape(-1).view(np.uint8)[:self.height * self.row_pitch].reshape(self.height, self.row_pitch)
+        return rows[:, :self.row_bytes].view(self.frame_dtype).reshape(self.frame_shape)
+
+    def new_frame_buffer(self):
+        """a buffer laid out for pull_image(), for callers that manage their own memory"""
+        return np.empty((self.height, self.row_pitch), dtype=np.uint8)
+
+    def get_dropped_frames(self):
+        """frames dropped by the SDK plus frames discarded because the pool was exhausted"""
+        dropped = self.dropped_frames
+        if self.cam is not None:
+            try:
+                dropped += self.cam.get_Option(toupcam.TOUPCAM_OPTION_NUMBER_DROP_FRAME)
+            except toupcam.HRESULTException:
+                pass
+        return dropped
 
     def get_auto_exposure(self):
         if self.cam is not None:
@@ -143,18 +494,55 @@ class ToupcamUnit(CameraUnit):
 
 
 class CVUnit(CameraUnit):
+    min_backoff = 0.01  # seconds to wait after the first failed grab
+    max_backoff = 1.0
+
     def __init__(self, cam_id):
         super().__init__(cam_id=cam_id)
         self.type = CamType.CV
+        self.seq = 0
+        self.skipped_frames = 0  # frames grabbed but never decoded because nobody was waiting for them
+        self.stop_event = threading.Event()
 
     def run(self):
-        while True:
-            ret, frame = self.cam.read()
-            self.signal_image.emit(frame)
+        backoff = self.min_backoff
+        while not self.stop_event.is_set():
+            # grab() only moves the frame off the device, retrieve() does the costly decode
+            if not self.cam.grab():
+                self.stop_event.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            backoff = self.min_backoff
+            host_timestamp = time.monotonic()
+            self.seq += 1
+
+            if not self.wants_frame():
+                self.skipped_frames += 1
+                continue
+            ret, frame = self.cam.retrieve()
+            if not ret:
+                continue
+            timestamp = int(self.cam.get(cv2.CAP_PROP_POS_MSEC) * 1000)
+            self.publish_frame(Frame(frame, timestamp, host_timestamp, self.seq, self.skipped_frames))
+
+    def wants_frame(self):
+        # sinks (recorders, analysis, ...) need every frame; without them a full mailbox means
+        # the consumer has not taken the previous frame yet and the decode can be skipped
+        return bool(self.sinks) or not self.mailbox.is_full() or self.latest_requested.is_set()
 
     def is_same(self, camera_unit):
         return self.cam_id == camera_unit.cam_id
 
+    def get_serial(self):
+        # OpenCV reports no serial number, the port has to identify the camera
+        return f"cv{self.cam_id}"
+
+    def get_frame_format(self):
+        # OpenCV converts every capture to 8-bit BGR
+        if not self.width or not self.height:
+            return None
+        return "bgr_8bit", (self.height, self.width, 3), np.dtype(np.uint8)
+
     def connect_to_camera(self):
         self.cam = cv2.VideoCapture(self.cam_id)
         if not self.cam.isOpened():
@@ -174,11 +562,17 @@ class CVUnit(CameraUnit):
 
         self.cam.set(cv2.CAP_PROP_FRAME_WIDTH, 1920)
         self.cam.set(cv2.CAP_PROP_FRAME_HEIGHT, 1080)
+        # the driver may settle on another resolution
+        self.width = int(self.cam.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cam.get(cv2.CAP_PROP_FRAME_HEIGHT))
 
+        self.stop_event.clear()
         self.start()
 
-    def close(self, event):
-        if not self.cam.isOpened():
+    def close(self, event=None):
+        self.stop_event.set()
+        self.wait()
+        if self.cam is None or not self.cam.isOpened():
             return
         self.cam.release()
         self.cam = None
@@ -0,0 +1,106 @@
+import pyqtgraph as pg
+from PySide6.QtCore import QTimer, Slot
+
+from deviceAPIs.camera.CameraUnit import CVUnit
+
+
+class CameraView(pg.GraphicsLayoutWidget):
+    """
+    Live view of one camera on a pyqtgraph ImageItem.
+
+    Frames are drawn as they are, 8 or 16 bits, mono, RGB or BGR, with fixed levels instead of a per-frame
+    autoLevels pass. Incoming frames only replace the pending one; a timer draws the newest frame at
+    most fps times per second, so a fast camera never queues up work on the GUI thread.
+    """
+
+    def __init__(self, parent=None, histogram=False, fps=30.0):
+        super().__init__(parent)
+        self.view_box = self.addViewBox(lockAspect=True, invertY=True, enableMenu=False)
+        self.image_item = pg.ImageItem(axisOrder="row-major")
+        self.view_box.addItem(self.image_item)
+
+        self.histogram = None
+        if histogram:
+            self.histogram = pg.HistogramLUTItem()
+            self.histogram.setImageItem(self.image_item)
+            self.addItem(self.histogram)
+
+        self.camera = None
+        self.idx = None
+        self.bgr = False  # OpenCV captures are BGR, Toupcam frames RGB
+        self.levels = None  # None follows the bit depth of the frames
+        self.drawn_frames = 0
+        self.skipped_frames = 0  # frames replaced before they were drawn
+
+        self._pending = None
+        self._bits = None
+        self._shape = None
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.draw)
+        self._timer.start(int(1000 / fps))
+
+    def attach(self, camera, idx, bgr=None):
+        """
+        show the frames camera emits on signal_frame for camera idx.
+        bgr: channel order of color frames, None picks it from the camera unit type
+        """
+        self.detach()
+        self.camera = camera
+        self.idx = idx
+        self.bgr = isinstance(camera.using_cameras[idx], CVUnit) if bgr is None else bgr
+        camera.signal_frame.connect(self.on_frame)
+
+    def detach(self):
+        if self.camera is not None:
+            self.camera.signal_frame.disconnect(self.on_frame)
+        self.camera = None
+        self.idx = None
+        self._pending = None
+
+    def set_fps(self, fps):
+        self._timer.start(int(1000 / fps))
+
+    def set_levels(self, levels):
+        """fixed (min, max) display levels, or None to span the full range of the frame bit depth"""
+        self.levels = levels
+        self._bits = None
+
+    @Slot(int, object)
+    def on_frame(self, idx, frame):
+        if idx != self.idx:
+            return
+        if self._pending is not None:
+            self.skipped_frames += 1
+        # only a reference is kept, the frame is drawn from the camera buffer itself
+        self._pending = frame
+
+    @Slot()
+    def draw(self):
+        frame = self._pending
+        if frame is None:
+            return
+        self._pending = None
+        image = frame.image
+        if self.bgr and image.ndim == 3:
+            image = image[..., ::-1]  # ImageItem draws RGB
+
+        levels = None
+        if frame.bits != self._bits:
+            self._bits = frame.bits
+            levels = self.levels if self.levels is not None else (0, (1 << frame.bits) - 1)
+            if self.histogram is not None:
+                self.histogram.setHistogramRange(*levels)
+        if levels is not None:
+            self.image_item.setImage(image, autoLevels=False, levels=levels)
+        else:
+            self.image_item.setImage(image, autoLevels=False)
+
+        if image.shape[:2] != self._shape:
+            self._shape = image.shape[:2]
+            self.view_box.autoRange(padding=0)
+        self.drawn_frames += 1
+
+    def closeEvent(self, event):
+        self._timer.stop()
+        self.detach()
+        super().closeEvent(event)
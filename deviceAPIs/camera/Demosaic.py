@@ -0,0 +1,107 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+# (row, col) of the red and blue sites in the 2x2 Bayer cell, green fills the other two
+BAYER_PATTERNS = {
+    "RGGB": ((0, 0), (1, 1)),
+    "BGGR": ((1, 1), (0, 0)),
+    "GRBG": ((0, 1), (1, 0)),
+    "GBRG": ((1, 0), (0, 1)),
+}
+
+_KERNEL_RB = np.array([[1, 2, 1], [2, 4, 2], [1, 2, 1]], dtype=np.float32) / 4
+_KERNEL_G = np.array([[0, 1, 0], [1, 4, 1], [0, 1, 0]], dtype=np.float32) / 4
+
+
+def fourcc_to_str(fourcc):
+    return int(fourcc).to_bytes(4, "little").decode("ascii", errors="replace")
+
+
+def _convolve3x3(plane, kernel, out, tmp):
+    # reflect padding keeps the Bayer parity of the border pixels
+    padded = np.pad(plane, 1, mode="reflect")
+    h, w = plane.shape
+    out.fill(0)
+    for dy in range(3):
+        for dx in range(3):
+            k = kernel[dy, dx]
+            if k:
+                np.multiply(padded[dy:dy + h, dx:dx + w], k, out=tmp)
+                out += tmp
+
+
+def demosaic_bilinear(mosaic, pattern, out=None):
+    """
+    bilinear demosaic of a HxW Bayer mosaic into a HxWx3 RGB image of the same dtype
+    pattern: one of BAYER_PATTERNS, such as "RGGB"
+    """
+    (ry, rx), (by, bx) = BAYER_PATTERNS[pattern]
+    h, w = mosaic.shape
+    if out is None:
+        out = np.empty((h, w, 3), dtype=mosaic.dtype)
+
+    plane = np.zeros((h, w), dtype=np.float32)
+    result = np.empty((h, w), dtype=np.float32)
+    tmp = np.empty((h, w), dtype=np.float32)
+    limit = np.iinfo(mosaic.dtype).max if mosaic.dtype.kind in "ui" else None
+
+    for channel, kernel in ((0, _KERNEL_RB), (1, _KERNEL_G), (2, _KERNEL_RB)):
+        plane.fill(0)
+        if channel == 1:
+            plane[...] = mosaic
+            plane[ry::2, rx::2] = 0
+            plane[by::2, bx::2] = 0
+        else:
+            y, x = (ry, rx) if channel == 0 else (by, bx)
+            plane[y::2, x::2] = mosaic[y::2, x::2]
+        _convolve3x3(plane, kernel, result, tmp)
+        if limit is not None:
+            np.clip(result, 0, limit, out=result)
+            np.rint(result, out=result)
+        out[..., channel] = result
+    return out
+
+
+class Demosaicer(QObject):
+    """
+    Demosaics raw frames on a worker pool, off the camera callback thread.
+    submit() refuses new frames while max_pending frames are in flight, so only the frames a
+    consumer can keep up with are ever demosaiced.
+    """
+    signal_image = Signal(object)  # Frame with the demosaiced RGB image
+    exception = Signal(str)
+
+    def __init__(self, max_workers=2, max_pending=2):
+        super().__init__()
+        self.max_pending = max_pending
+        self.skipped = 0  # frames refused because the pool was busy
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="demosaic")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def submit(self, frame):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.skipped += 1
+                return False
+            self._pending += 1
+        future = self._executor.submit(demosaic_bilinear, frame.image, frame.bayer)
+        future.add_done_callback(lambda f: self._on_done(frame, f))
+        return True
+
+    def _on_done(self, frame, future):
+        with self._lock:
+            self._pending -= 1
+        try:
+            image = future.result()
+        except Exception as e:
+            self.exception.emit(f"demosaic failed: {e}")
+            return
+        self.signal_image.emit(frame._replace(image=image, bayer=None))
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
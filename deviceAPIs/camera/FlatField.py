@@ -0,0 +1,149 @@
+import os
+import threading
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+CALIBRATION_DIR = os.path.join(os.path.expanduser("~"), ".deviceAPIs", "calibration")
+
+
+def calibration_path(serial, width, height, frame_format):
+    """cache file of the references of one camera at one resolution and frame format (e.g. raw_12bit)"""
+    return os.path.join(CALIBRATION_DIR, f"{serial}_{width}x{height}_{frame_format}.npz")
+
+
+if numba is not None:
+    # serial on purpose: it runs on the SDK callback thread of every camera, and the parallel
+    # workqueue layer aborts when two threads enter a parallel region at once
+    @numba.njit(fastmath=True, cache=True)
+    def _correct(image, gain, offset, maximum, out):
+        # one pass over the frame: scale, shift, clip and round back to the integer type
+        for i in range(image.size):
+            value = image[i] * gain[i] + offset[i]
+            if value < 0.0:
+                value = 0.0
+            elif value > maximum:
+                value = maximum
+            out[i] = value + 0.5
+else:
+    _correct = None
+
+
+def _warm_up():
+    """compile the kernel for camera frame types now, not on the first corrected frame"""
+    if _correct is None:
+        return
+    coefficients = np.ones(1, np.float32)
+    for dtype in (np.uint8, np.uint16):
+        image = np.zeros(1, dtype)
+        _correct(image, coefficients, coefficients, 1.0, image)
+
+
+class FlatFieldCorrection:
+    """
+    Software dark-frame and flat-field correction, (image - dark) * mean(flat - dark) / (flat - dark).
+
+    The references are folded into a gain and an offset map once, so each frame costs one multiply-add.
+    Works on live frames (CameraUnit.set_correction) and on recorded ones alike.
+    """
+
+    def __init__(self, dark=None, flat=None):
+        self.dark = None
+        self.flat = None
+        self.gain = None
+        self.offset = None
+        self._scratch = None
+        self._lock = threading.Lock()
+        if dark is not None or flat is not None:
+            self.set_references(dark, flat)
+
+    @property
+    def shape(self):
+        return None if self.gain is None else self.gain.shape
+
+    def set_references(self, dark=None, flat=None):
+        """
+        dark: mean of frames taken without light, flat: mean of frames of a uniform bright field.
+        either may be None for a dark-only or flat-only correction
+        """
+        reference = dark if dark is not None else flat
+        if reference is None:
+            raise ValueError("a dark or a flat reference is required")
+        dark = np.zeros(reference.shape, np.float32) if dark is None else np.asarray(dark, np.float32)
+        if flat is None:
+            gain = np.ones(dark.shape, np.float32)
+        else:
+            flat = np.asarray(flat, np.float32)
+            if flat.shape != dark.shape:
+                raise ValueError(f"dark {dark.shape} and flat {flat.shape} references differ in shape")
+            signal = flat - dark
+            # color frames are flattened per channel so the correction keeps the white balance
+            axes = tuple(range(signal.ndim - 1)) if signal.ndim == 3 else None
+            target = signal.mean(axis=axes, keepdims=True)
+            # dead pixels without signal are left as they are
+            gain = np.divide(target, signal, out=np.ones_like(signal), where=signal > 0).astype(np.float32)
+        with self._lock:
+            self.dark = dark
+            self.flat = flat
+            self.gain = np.ascontiguousarray(gain)
+            self.offset = np.ascontiguousarray(-dark * gain)
+            self._scratch = None
+        _warm_up()
+
+    def apply(self, image, bits=None, out=None):
+        """
+        return the corrected frame with the dtype of image; out may be image itself for an in-place pass.
+        bits: significant bits of integer frames, corrected values are clipped to them
+        """
+        with self._lock:
+            gain, offset = self.gain, self.offset
+            if gain is None:
+                return image
+            if image.shape != gain.shape:
+                raise ValueError(f"frame {image.shape} does not match the calibration {gain.shape}")
+            if out is None:
+                out = np.empty_like(image)
+            if image.dtype.kind != "u":
+                np.multiply(image, gain, out=out)
+                np.add(out, offset, out=out)
+                return out
+
+            maximum = float((1 << (bits or image.dtype.itemsize * 8)) - 1)
+            if _correct is not None and image.flags.c_contiguous and out.flags.c_contiguous:
+                _correct(image.reshape(-1), gain.reshape(-1), offset.reshape(-1), maximum, out.reshape(-1))
+                return out
+
+            if self._scratch is None:
+                self._scratch = np.empty(gain.shape, np.float32)
+            scratch = self._scratch
+            np.multiply(image, gain, out=scratch)
+            np.add(scratch, offset, out=scratch)
+            np.clip(scratch, 0, maximum, out=scratch)
+            np.rint(scratch, out=scratch)
+            np.copyto(out, scratch, casting="unsafe")
+            return out
+
+    def save(self, path, dtype=None):
+        """dtype: of the frames the references were taken from, checked again by load()"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        references = {"dark": self.dark}
+        if self.flat is not None:
+            references["flat"] = self.flat
+        if dtype is not None:
+            references["dtype"] = np.array(np.dtype(dtype).str)
+        np.savez(path, **references)
+
+    @classmethod
+    def load(cls, path, shape=None, dtype=None):
+        """raise ValueError if the references were taken from frames of another shape or dtype"""
+        with np.load(path) as references:
+            dark = references["dark"]
+            if shape is not None and dark.shape != tuple(shape):
+                raise ValueError(f"{path}: references {dark.shape} do not match frames {tuple(shape)}")
+            if dtype is not None and "dtype" in references and np.dtype(str(references["dtype"])) != np.dtype(dtype):
+                raise ValueError(f"{path}: references of {references['dtype']} frames do not match {np.dtype(dtype)}")
+            return cls(dark, references["flat"] if "flat" in references else None)
@@ -0,0 +1,103 @@
+import threading
+
+import cv2
+import numpy as np
+
+
+class FocusMethod:
+    LAPLACIAN = 0  # variance of the Laplacian
+    TENENGRAD = 1  # mean squared Sobel gradient magnitude
+
+    @classmethod
+    def get_name(cls, num):
+        focus_method = {
+            cls.LAPLACIAN: "LAPLACIAN",
+            cls.TENENGRAD: "TENENGRAD",
+        }
+        return focus_method.get(num, "UNKNOWN")
+
+
+def variance_of_laplacian(gray):
+    return float(cv2.Laplacian(gray, cv2.CV_32F, ksize=3).var())
+
+
+def tenengrad(gray):
+    gx = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
+    gy = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
+    return float(np.mean(gx * gx + gy * gy))
+
+
+class FocusMeter:
+    """
+    Sharpness score of every frame, computed on a worker thread.
+
+    Only roi (x, y, width, height; None = the whole frame) is looked at, every step-th pixel of it.
+    As a camera sink it only copies that decimated view, a fraction of the frame, and hands it to the
+    worker; a view the worker has not picked up yet is replaced by the newer one and counted in skipped.
+    Color frames are scored on their green channel, raw Bayer mosaics on one pixel of each 2 x 2 cell.
+    callback(host_timestamp, score) receives the scores from the worker thread; higher is sharper.
+    """
+
+    def __init__(self, callback, method=FocusMethod.LAPLACIAN, roi=None, step=2):
+        self.callback = callback
+        self.method = method
+        self.roi = roi
+        self.step = step
+        self.skipped = 0  # frames replaced before the worker scored them
+
+        self._condition = threading.Condition()
+        self._pending = None  # (host_timestamp, decimated gray image)
+        self._stopped = False
+        self._thread = threading.Thread(target=self._score_loop, name="focus-meter", daemon=True)
+        self._thread.start()
+
+    def __call__(self, frame):
+        gray = self.decimate(frame)
+        with self._condition:
+            if self._stopped:
+                return
+            if self._pending is not None:
+                self.skipped += 1
+            self._pending = (frame.host_timestamp, gray)
+            self._condition.notify()
+
+    def _score_loop(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                host_timestamp, gray = self._pending
+                self._pending = None
+            self.callback(host_timestamp, self.measure(gray))
+
+    def decimate(self, frame):
+        """contiguous float32 copy of the pixels that are scored"""
+        image = frame.image
+        if self.roi is not None:
+            x, y, width, height = self.roi
+            image = image[y:y + height, x:x + width]
+        # an even step keeps raw mosaics on pixels of one color
+        step = max(self.step + self.step % 2, 2) if frame.bayer is not None else self.step
+        image = image[::step, ::step]
+        if image.ndim == 3:
+            image = image[..., 1]
+        # cv2 needs a contiguous input, the strided view is copied into a small float buffer
+        return np.ascontiguousarray(image, dtype=np.float32)
+
+    def measure(self, gray):
+        if self.method == FocusMethod.TENENGRAD:
+            return tenengrad(gray)
+        return variance_of_laplacian(gray)
+
+    def score(self, frame):
+        """score frame on the calling thread"""
+        return self.measure(self.decimate(frame))
+
+    def close(self):
+        """stop the worker, a frame it has not picked up yet is not scored"""
+        with self._condition:
+            self._stopped = True
+            self._pending = None
+            self._condition.notify()
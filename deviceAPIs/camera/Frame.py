@@ -0,0 +1,13 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+class Frame(NamedTuple):
+    image: np.ndarray
+    timestamp: int  # device timestamp, microsecond (0 if the device does not report one)
+    host_timestamp: float  # time.monotonic() when the frame reached the host, second
+    seq: int  # sequence number
+    dropped: int  # cumulative number of frames dropped before reaching the host
+    bits: int = 8  # significant bits per sample
+    bayer: Optional[str] = None  # Bayer pattern such as "RGGB" when image is a raw mosaic
@@ -0,0 +1,132 @@
+import queue
+import threading
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+
+class FrameAccumulator(QObject):
+    """
+    Sums camera frames in place into preallocated float32 buffers for averaging and stacking.
+    The standard deviation is summed in float64 relative to the first frame, to stay exact for 16-bit data.
+
+    As a camera sink it only copies the frame into a queue of max_queue frames; the sums are done on a
+    worker thread. Frames arriving while the queue is full are dropped and counted.
+
+    Every `every` frames (0: only through compute()) the mean, and with `std` the standard deviation,
+    are emitted on signal_result. With reset the sums restart after each result (block averages),
+    otherwise they keep growing (a stack over the whole run).
+    """
+    signal_result = Signal(int, object, object)  # number of frames, mean, std or None
+    exception = Signal(str)
+
+    def __init__(self, every=16, std=False, reset=True, max_queue=4):
+        super().__init__()
+        self.every = every
+        self.std = std
+        self.reset_after_result = reset
+        self.count = 0
+        self.dropped = 0  # frames refused because the worker fell behind
+
+        self._lock = threading.Lock()
+        self._sum = None
+        self._shift = None  # first frame of the block, the variance is summed relative to it
+        self._sum_dev = None
+        self._sum_sq = None
+        self._square = None  # scratch for the deviation and its square
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stopped = False
+        self._thread = threading.Thread(target=self._accumulate_loop, name="frame-accumulator", daemon=True)
+        self._thread.start()
+
+    def __call__(self, frame):
+        if self._stopped:
+            return
+        if self._queue.full():
+            self.dropped += 1
+            return
+        # the copy releases the camera buffer at once, the sums are done on the worker thread
+        self._queue.put(np.array(frame.image, copy=True))
+
+    def _accumulate_loop(self):
+        while True:
+            image = self._queue.get()
+            if image is None:
+                break
+            try:
+                self.add(image)
+            except Exception as e:
+                self.exception.emit(f"accumulating frames failed: {e}")
+
+    def add(self, image):
+        with self._lock:
+            if self._sum is None or self._sum.shape != image.shape:
+                self._allocate(image.shape)
+            np.add(self._sum, image, out=self._sum)
+            if self._sum_sq is not None:
+                if self.count == 0:
+                    np.copyto(self._shift, image)
+                # deviations from the first frame in float64: E[x^2] - E[x]^2 of raw 16-bit values
+                # would cancel away the variance
+                np.subtract(image, self._shift, out=self._square)
+                np.add(self._sum_dev, self._square, out=self._sum_dev)
+                np.square(self._square, out=self._square)
+                np.add(self._sum_sq, self._square, out=self._sum_sq)
+            self.count += 1
+            if not self.every or self.count % self.every:
+                return
+            result = self._result()
+            if self.reset_after_result:
+                self._clear()
+        self.signal_result.emit(*result)
+
+    def compute(self):
+        """(count, mean, std or None) of the frames summed so far, without resetting"""
+        with self._lock:
+            return self._result()
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    def close(self, wait=True):
+        """stop accepting frames, the queued ones are still summed"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
+
+    def _allocate(self, shape):
+        self._sum = np.zeros(shape, dtype=np.float32)
+        if self.std:
+            self._shift = np.empty(shape, dtype=np.float64)
+            self._sum_dev = np.zeros(shape, dtype=np.float64)
+            self._sum_sq = np.zeros(shape, dtype=np.float64)
+            self._square = np.empty(shape, dtype=np.float64)
+        self.count = 0
+
+    def _clear(self):
+        self.count = 0
+        if self._sum is not None:
+            self._sum.fill(0)
+        if self._sum_sq is not None:
+            self._sum_dev.fill(0)
+            self._sum_sq.fill(0)
+
+    def _result(self):
+        if not self.count:
+            return 0, None, None
+        # the results outlive the next frame, so they are the only allocations
+        mean = np.divide(self._sum, self.count)
+        if self._sum_sq is None:
+            return self.count, mean, None
+        np.divide(self._sum_dev, self.count, out=self._square)
+        np.square(self._square, out=self._square)
+        variance = np.divide(self._sum_sq, self.count)
+        variance -= self._square
+        np.maximum(variance, 0, out=variance)  # rounding can leave tiny negative variances
+        std = np.sqrt(variance, dtype=np.float32)
+        return self.count, mean, std
@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+
+from deviceAPIs.camera.SharedFrameRing import SharedFrameReader
+
+# readers opened by a worker process, by ring name
+_readers = {}
+
+
+def _analyze(func, image):
+    return func(image)
+
+
+def _analyze_shared(func, name, ring_seq):
+    reader = _readers.get(name)
+    if reader is None:
+        # rings the publisher has closed since are not coming back
+        for stale in [key for key, cached in _readers.items() if cached.is_stale()]:
+            _readers.pop(stale).close()
+        try:
+            reader = SharedFrameReader(name)
+        except (FileNotFoundError, ValueError):
+            return None  # closed before this worker got to it
+        _readers[name] = reader
+    elif reader.is_stale():
+        return None
+    frame = reader.read(ring_seq)
+    if frame is None:
+        return None  # overwritten before this worker got to it
+    result = func(frame.image)
+    # a result computed from a slot that was rewritten meanwhile is discarded
+    return result if reader.is_valid(frame) else None
+
+
+class FrameAnalyzer(QObject):
+    """
+    Runs an analysis callable on camera frames in a process pool, off the acquisition and GUI threads.
+
+    func(image) must be picklable (a module-level function) and return a picklable result.
+    Frames arriving while max_pending analyses are in flight are skipped. With a shared-memory
+    publisher, workers read the frame from the ring instead of receiving a pickled copy.
+    """
+    signal_result = Signal(int, object)  # camera seq, result
+    exception = Signal(str)
+
+    def __init__(self, func, max_workers=2, max_pending=None, publisher=None):
+        super().__init__()
+        self.func = func
+        self.max_pending = max_workers if max_pending is None else max_pending
+        self.publisher = publisher
+        self.skipped = 0  # frames refused because the pool was busy
+
+        self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def __call__(self, frame):
+        self.submit(frame)
+
+    def submit(self, frame):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.skipped += 1
+                return False
+            self._pending += 1
+        # the publisher sink runs first, so its latest seq is the ring copy of this frame
+        name, ring_seq = self.publisher.latest() if self.publisher is not None else (None, 0)
+        if ring_seq:
+            future = self._executor.submit(_analyze_shared, self.func, name, ring_seq)
+        else:
+            future = self._executor.submit(_analyze, self.func, frame.image)
+        future.add_done_callback(lambda f: self._on_done(frame.seq, f))
+        return True
+
+    def _on_done(self, seq, future):
+        with self._lock:
+            self._pending -= 1
+        if future.cancelled():
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            self.exception.emit(f"analysis {self.func} failed: {e}")
+            return
+        if result is not None:
+            self.signal_result.emit(seq, result)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,77 @@
+import threading
+from collections import deque
+
+
+class DropPolicy:
+    DROP_OLDEST = 0
+    DROP_NEWEST = 1
+    BLOCK = 2
+
+    @classmethod
+    def get_name(cls, num):
+        policy = {
+            cls.DROP_OLDEST: "drop oldest",
+            cls.DROP_NEWEST: "drop newest",
+            cls.BLOCK: "block",
+        }
+        return policy.get(num, "UNKNOWN")
+
+
+class FrameMailbox:
+    """
+    Bounded hand-off between a camera thread and its consumer.
+
+    put() is called from the acquisition thread and reports whether the consumer has to be
+    woken up, so the producer posts at most one Qt event per batch instead of one per frame.
+    """
+
+    def __init__(self, depth=1, policy=DropPolicy.DROP_OLDEST, block_timeout=1.0):
+        if depth < 1:
+            raise ValueError(f"mailbox depth must be at least 1: {depth}")
+        self.depth = depth
+        self.policy = policy
+        self.block_timeout = block_timeout  # seconds a blocked producer waits before dropping
+        self.dropped = 0  # frames lost to the drop policy
+        self.delivered = 0  # frames handed to the consumer
+
+        self._frames = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, frame):
+        """return True if the mailbox was empty, i.e. the consumer must be notified"""
+        with self._cond:
+            if len(self._frames) >= self.depth:
+                if self.policy == DropPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.policy == DropPolicy.BLOCK:
+                    self._cond.wait_for(lambda: len(self._frames) < self.depth or self._closed,
+                                        self.block_timeout)
+                    if self._closed or len(self._frames) >= self.depth:
+                        self.dropped += 1
+                        return False
+                else:
+                    self._frames.popleft()
+                    self.dropped += 1
+            was_empty = not self._frames
+            self._frames.append(frame)
+            return was_empty
+
+    def take_all(self):
+        with self._cond:
+            frames = list(self._frames)
+            self._frames.clear()
+            self.delivered += len(frames)
+            self._cond.notify_all()
+            return frames
+
+    def is_full(self):
+        with self._cond:
+            return len(self._frames) >= self.depth
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._frames.clear()
+            self._cond.notify_all()
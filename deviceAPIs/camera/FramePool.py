@@ -0,0 +1,53 @@
+import threading
+import weakref
+from collections import deque
+
+import numpy as np
+
+
+class FramePool:
+    """
+    Preallocated ring of writable frame buffers.
+
+    acquire() hands out a free slot for the SDK to write into, lease() wraps that slot in an
+    array whose lifetime is the lease: the slot goes back to the pool when the leased array
+    and every view taken from it have been released by the consumers.
+    """
+
+    def __init__(self, shape, dtype=np.uint8, count=4):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.count = count
+        self.frames = np.zeros((count,) + self.shape, dtype=self.dtype)
+        self.exhausted = 0  # number of acquire() calls that found no free slot
+
+        self._lock = threading.Lock()
+        self._free = deque(range(count))
+
+    def acquire(self):
+        with self._lock:
+            if not self._free:
+                self.exhausted += 1
+                return None
+            return self._free.popleft()
+
+    def release(self, slot):
+        with self._lock:
+            self._free.append(slot)
+
+    def slot(self, slot):
+        return self.frames[slot]
+
+    def lease(self, slot):
+        # the memoryview stops numpy from collapsing view bases onto self.frames,
+        # so every view a consumer derives keeps this lease alive
+        leased = np.asarray(memoryview(self.frames[slot]))
+        weakref.finalize(leased, self.release, slot)
+        return leased
+
+    def free_count(self):
+        with self._lock:
+            return len(self._free)
+
+    def is_compatible(self, shape, dtype):
+        return self.shape == tuple(shape) and self.dtype == np.dtype(dtype)
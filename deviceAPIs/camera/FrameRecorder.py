@@ -0,0 +1,184 @@
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+
+class RecordFormat:
+    MEMMAP = 0  # one preallocated raw file, frames at fixed offsets
+    NPY = 1  # a sequence of .npy files of chunk_frames frames each
+
+    @classmethod
+    def get_name(cls, num):
+        record_format = {
+            cls.MEMMAP: "MEMMAP",
+            cls.NPY: "NPY",
+        }
+        return record_format.get(num, "UNKNOWN")
+
+
+_INDEX = np.dtype([
+    ("seq", "<i8"),
+    ("timestamp", "<i8"),
+    ("host_timestamp", "<f8"),
+    ("dropped", "<i8"),
+])
+
+
+class FrameRecorder(QObject):
+    """
+    Records camera frames to disk on a background writer thread.
+
+    As a camera sink it only copies the frame and queues it, so the camera buffer pool is never held
+    by a slow disk. Once max_backlog_bytes of frames are waiting, further frames are dropped and
+    counted instead of blocking the camera callback or growing the queue until memory runs out.
+    Frames go to <path>.raw (MEMMAP, max_frames preallocated) or to
+    <path>_00000.npy, <path>_00001.npy, ... (NPY), and the per-frame seq and timestamps to
+    <path>_index.npz when the recording is closed.
+    """
+    signal_backlog = Signal(int)  # frames waiting for the writer, on change and at most every backlog_interval
+    signal_finished = Signal(int)  # number of frames written
+    exception = Signal(str)
+
+    def __init__(self, path, record_format=RecordFormat.MEMMAP, max_frames=1000, chunk_frames=64,
+                 max_backlog_bytes=1 << 30, backlog_interval=0.2):
+        super().__init__()
+        self.path = path
+        self.record_format = record_format
+        self.max_frames = max_frames
+        self.chunk_frames = chunk_frames
+        self.max_backlog_bytes = max_backlog_bytes
+        self.backlog_interval = backlog_interval  # seconds between signal_backlog emissions
+        self.written = 0
+        self.dropped = 0  # frames refused because the writer fell behind, the memmap was full or the layout changed
+
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._backlog_frames = 0
+        self._backlog_bytes = 0
+        self._reported_backlog = 0
+        self._reported_at = 0.0
+        self._index = np.zeros(max_frames if record_format == RecordFormat.MEMMAP else chunk_frames, dtype=_INDEX)
+        self._shape = None
+        self._dtype = None
+        self._bits = 8
+        self._data = None
+        self._chunk = 0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._write_loop, name="frame-recorder", daemon=True)
+        self._thread.start()
+
+    def __call__(self, frame):
+        if self._stopped:
+            return
+        nbytes = frame.image.nbytes
+        with self._lock:
+            if self._backlog_bytes and self._backlog_bytes + nbytes > self.max_backlog_bytes:
+                self.dropped += 1
+                return
+            self._backlog_frames += 1
+            self._backlog_bytes += nbytes
+        # the copy releases the camera buffer at once, the writer may lag behind by several frames
+        self._queue.put(frame._replace(image=np.array(frame.image, copy=True)))
+
+    def backlog(self):
+        return self._backlog_frames
+
+    def _write_loop(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            try:
+                self._write(frame)
+            except Exception as e:
+                self.dropped += 1
+                self.exception.emit(f"recording {self.path} failed: {e}")
+            with self._lock:
+                self._backlog_frames -= 1
+                self._backlog_bytes -= frame.image.nbytes
+            self._report_backlog()
+        try:
+            self._finish()
+        except Exception as e:
+            self.exception.emit(f"recording {self.path} failed: {e}")
+        self.signal_finished.emit(self.written)
+
+    def _report_backlog(self):
+        backlog = self._backlog_frames
+        if backlog == self._reported_backlog:
+            return
+        now = time.monotonic()
+        # an emptied queue is reported at once, so the last value seen is never a stale backlog
+        if backlog and now - self._reported_at < self.backlog_interval:
+            return
+        self._reported_backlog = backlog
+        self._reported_at = now
+        self.signal_backlog.emit(backlog)
+
+    def _write(self, frame):
+        image = frame.image
+        if self._shape is None:
+            self._shape, self._dtype, self._bits = image.shape, image.dtype, frame.bits
+            self._allocate()
+        elif image.shape != self._shape or image.dtype != self._dtype:
+            self.dropped += 1
+            return
+
+        if self.record_format == RecordFormat.MEMMAP:
+            if self.written >= self.max_frames:
+                self.dropped += 1
+                return
+            row = self.written
+        else:
+            row = self.written % self.chunk_frames
+        self._data[row] = image
+        self._index[self.written if self.record_format == RecordFormat.MEMMAP else row] = (
+            frame.seq, frame.timestamp, frame.host_timestamp, frame.dropped)
+        self.written += 1
+
+        if self.record_format == RecordFormat.NPY and row == self.chunk_frames - 1:
+            self._save_chunk(self.chunk_frames)
+
+    def _allocate(self):
+        if self.record_format == RecordFormat.MEMMAP:
+            self._data = np.memmap(self.path + ".raw", dtype=self._dtype, mode="w+",
+                                   shape=(self.max_frames,) + self._shape)
+        else:
+            self._data = np.empty((self.chunk_frames,) + self._shape, dtype=self._dtype)
+            self._chunk_index = []
+
+    def _save_chunk(self, count):
+        np.save(f"{self.path}_{self._chunk:05d}.npy", self._data[:count])
+        self._chunk_index.append(self._index[:count].copy())
+        self._chunk += 1
+
+    def _finish(self):
+        if self._data is None:
+            return
+        if self.record_format == RecordFormat.MEMMAP:
+            self._data.flush()
+            index = self._index[:self.written]
+            # drop the preallocated tail that was never written
+            del self._data
+            self._data = None
+            os.truncate(self.path + ".raw", self.written * int(np.prod(self._shape)) * self._dtype.itemsize)
+        else:
+            remainder = self.written % self.chunk_frames
+            if remainder:
+                self._save_chunk(remainder)
+            index = np.concatenate(self._chunk_index) if self._chunk_index else self._index[:0]
+        np.savez(self.path + "_index.npz", index=index, shape=np.array(self._shape), dtype=str(self._dtype),
+                 bits=self._bits, record_format=self.record_format)
+
+    def close(self, wait=True):
+        """stop accepting frames, write out the backlog and the index"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
@@ -0,0 +1,61 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+class PixelFormat:
+    RGB24 = 0
+    RGB48 = 1
+    MONO8 = 2
+    MONO16 = 3
+
+    @classmethod
+    def get_name(cls, num):
+        pixel_format = {
+            cls.RGB24: "RGB24",
+            cls.RGB48: "RGB48",
+            cls.MONO8: "Mono8",
+            cls.MONO16: "Mono16",
+        }
+        return pixel_format.get(num, "UNKNOWN")
+
+    @classmethod
+    def is_mono(cls, num):
+        return num in (cls.MONO8, cls.MONO16)
+
+    @classmethod
+    def is_16bit(cls, num):
+        return num in (cls.RGB48, cls.MONO16)
+
+    @classmethod
+    def channels(cls, num):
+        return 1 if cls.is_mono(num) else 3
+
+    @classmethod
+    def dtype(cls, num):
+        return np.dtype(np.uint16 if cls.is_16bit(num) else np.uint8)
+
+    @classmethod
+    def pull_bits(cls, num):
+        """the bits argument of Toupcam.PullImage*"""
+        return {cls.RGB24: 24, cls.RGB48: 48, cls.MONO8: 8, cls.MONO16: 16}[num]
+
+    @classmethod
+    def rgb_option(cls, num):
+        """the value of TOUPCAM_OPTION_RGB"""
+        return {cls.RGB24: 0, cls.RGB48: 1, cls.MONO8: 3, cls.MONO16: 4}[num]
+
+
+@lru_cache(maxsize=None)
+def display_lut(bits):
+    """uint16 -> uint8 lookup table keeping the top 8 of the significant bits"""
+    return np.clip(np.arange(1 << 16) >> max(bits - 8, 0), 0, 255).astype(np.uint8)
+
+
+def to_8bit(image, bits, out=None):
+    """convert a high bit-depth frame to uint8 for display with a single table lookup pass"""
+    if image.dtype == np.uint8:
+        return image
+    if out is None:
+        out = np.empty(image.shape, dtype=np.uint8)
+    return np.take(display_lut(bits), image, out=out)
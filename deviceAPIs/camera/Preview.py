@@ -0,0 +1,84 @@
+import threading
+
+import cv2
+import numpy as np
+from PySide6.QtCore import QObject, Qt, Signal, Slot
+
+from deviceAPIs.camera.PixelFormat import to_8bit
+
+
+def preview_size(shape, width, height):
+    """largest (width, height) fitting into width x height with the aspect ratio of shape, never upscaled"""
+    scale = min(width / shape[1], height / shape[0], 1.0)
+    return max(int(shape[1] * scale), 1), max(int(shape[0] * scale), 1)
+
+
+class Previewer(QObject):
+    """
+    Display stream of a camera: frames are downsampled to fit width x height and limited to fps
+    on the acquisition thread, so the GUI only receives small 8-bit images at the rate it can show.
+    While an image is still waiting for the GUI thread, newer frames are skipped instead of queued.
+    """
+    signal_image = Signal(np.ndarray)
+    exception = Signal(str)
+    _signal_scaled = Signal(np.ndarray)
+
+    def __init__(self, width, height, fps=30.0, interpolation=cv2.INTER_AREA):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.interval = 1.0 / fps if fps else 0.0
+        self.interpolation = interpolation
+        self.skipped = 0  # frames over the fps limit or arriving while the GUI had not taken the last one
+
+        self._lock = threading.Lock()
+        self._last = float("-inf")
+        self._pending = False
+        # queued to the thread this previewer lives in, the GUI thread
+        self._signal_scaled.connect(self._on_scaled, Qt.QueuedConnection)
+
+    def __call__(self, frame):
+        with self._lock:
+            if self._pending or frame.host_timestamp - self._last < self.interval:
+                self.skipped += 1
+                return
+            self._last = frame.host_timestamp
+            self._pending = True
+        try:
+            image = self.scale(frame)
+        except Exception:
+            with self._lock:
+                self._pending = False
+            raise
+        self._signal_scaled.emit(image)
+
+    @Slot(np.ndarray)
+    def _on_scaled(self, image):
+        with self._lock:
+            self._pending = False
+        self.signal_image.emit(image)
+
+    def set_size(self, width, height):
+        self.width, self.height = width, height
+
+    def set_fps(self, fps):
+        self.interval = 1.0 / fps if fps else 0.0
+
+    def set_interpolation(self, interpolation):
+        """a cv2.INTER_* flag, or None for stride slicing"""
+        self.interpolation = interpolation
+
+    def scale(self, frame):
+        image = frame.image
+        size = preview_size(image.shape, self.width, self.height)
+        if size != (image.shape[1], image.shape[0]):
+            if self.interpolation is None:
+                # stride slicing: no filtering, cheapest for very large frames
+                step = max(image.shape[1] // size[0], image.shape[0] // size[1], 1)
+                image = np.ascontiguousarray(image[::step, ::step])
+            else:
+                image = cv2.resize(image, size, interpolation=self.interpolation)
+        # reducing the bit depth after the resize touches far fewer pixels
+        image = to_8bit(image, frame.bits)
+        # the GUI may keep the array after this frame's buffer went back to the camera
+        return image if image.base is None and image is not frame.image else image.copy()
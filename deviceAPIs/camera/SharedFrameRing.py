@@ -0,0 +1,222 @@
+import itertools
+import os
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from deviceAPIs.camera.Frame import Frame
+
+MAGIC = b"DAPI"
+ALIGNMENT = 64
+
+_HEADER = np.dtype([
+    ("magic", "S4"),
+    ("slots", "<u4"),
+    ("slot_bytes", "<u8"),
+    ("latest", "<u8"),  # seq of the last complete frame, 0 before the first one
+], align=True)
+
+_SLOT_HEADER = np.dtype([
+    ("begin", "<u8"),  # seq being written, equal to end once the slot is complete
+    ("end", "<u8"),
+    ("timestamp", "<i8"),
+    ("host_timestamp", "<f8"),
+    ("dropped", "<u8"),
+    ("nbytes", "<u8"),
+    ("ndim", "<u4"),
+    ("shape", "<u4", (3,)),
+    ("bits", "<u4"),
+    ("dtype", "S8"),
+    ("bayer", "S4"),
+], align=True)
+
+
+_generation = itertools.count(1)
+
+
+def shared_memory_name(idx, prefix="deviceAPIs_camera"):
+    """a name no other ring uses, so a new ring never collides with one that is still mapped somewhere"""
+    return f"{prefix}{idx}_{os.getpid()}_{next(_generation)}"
+
+
+def _aligned(n):
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _retire(shm):
+    # readers still mapping a ring that is about to be unlinked see the cleared magic and re-attach
+    if shm.size >= _HEADER.itemsize:
+        header = np.ndarray((), dtype=_HEADER, buffer=shm.buf)
+        header["magic"] = b""
+        del header
+
+
+class _Ring:
+    def __init__(self, shm):
+        self.shm = shm
+        self.header = np.ndarray((), dtype=_HEADER, buffer=shm.buf)
+        slots = int(self.header["slots"])
+        self.slot_bytes = int(self.header["slot_bytes"])
+        self.slot_headers = np.ndarray((slots,), dtype=_SLOT_HEADER, buffer=shm.buf, offset=_aligned(_HEADER.itemsize))
+        self.data_offset = _aligned(_HEADER.itemsize) + _aligned(slots * _SLOT_HEADER.itemsize)
+        self.slots = slots
+
+    @staticmethod
+    def size(slots, slot_bytes):
+        return _aligned(_HEADER.itemsize) + _aligned(slots * _SLOT_HEADER.itemsize) + slots * _aligned(slot_bytes)
+
+    def data(self, slot, dtype, shape):
+        offset = self.data_offset + slot * _aligned(self.slot_bytes)
+        return np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+
+    def release(self):
+        # the numpy views must go before the mapping can be closed
+        self.header = None
+        self.slot_headers = None
+
+
+class SharedFramePublisher:
+    """
+    Camera frame sink that copies every frame into a multiprocessing.shared_memory ring.
+
+    Each slot carries a header with the sequence number, shape and dtype of its frame, so worker
+    processes can attach with SharedFrameReader(name) and read frames without pickling.
+    The ring is created on the first frame and sized for it; larger frames are skipped.
+    Every ring gets a new name, and only rings this publisher created are unlinked.
+    """
+
+    def __init__(self, idx, slots=4, prefix="deviceAPIs_camera"):
+        self.idx = idx
+        self.prefix = prefix
+        self.name = None  # name of the current ring, None until the first frame
+        self.slots = slots
+        self.skipped = 0  # frames that did not fit into a slot
+        self.last_seq = 0  # ring seq of the last frame written, 0 before the first one
+
+        self._ring = None
+        self._lock = threading.Lock()
+
+    def __call__(self, frame):
+        image = np.ascontiguousarray(frame.image)
+        with self._lock:
+            if self._ring is None:
+                self._create(image.nbytes)
+            ring = self._ring
+            if image.nbytes > ring.slot_bytes or image.ndim > 3:
+                self.skipped += 1
+                self.last_seq = 0
+                return
+
+            seq = int(ring.header["latest"]) + 1
+            slot = seq % ring.slots
+            header = ring.slot_headers[slot]
+            header["begin"] = seq
+            np.copyto(ring.data(slot, image.dtype, image.shape), image)
+            header["timestamp"] = frame.timestamp
+            header["host_timestamp"] = frame.host_timestamp
+            header["dropped"] = frame.dropped
+            header["nbytes"] = image.nbytes
+            header["ndim"] = image.ndim
+            header["shape"] = image.shape + (0,) * (3 - image.ndim)
+            header["bits"] = frame.bits
+            header["dtype"] = image.dtype.str.encode("ascii")
+            header["bayer"] = (frame.bayer or "").encode("ascii")
+            header["end"] = seq
+            ring.header["latest"] = seq
+            self.last_seq = seq
+
+    def latest(self):
+        """(ring name, seq) of the last frame written, seq is 0 when there is none"""
+        with self._lock:
+            return self.name, self.last_seq
+
+    def _create(self, slot_bytes):
+        # rings left behind by a crashed process are unlinked by its resource tracker
+        name = shared_memory_name(self.idx, self.prefix)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_Ring.size(self.slots, slot_bytes))
+        self.name = name
+        header = np.ndarray((), dtype=_HEADER, buffer=shm.buf)
+        header["magic"] = MAGIC
+        header["slots"] = self.slots
+        header["slot_bytes"] = slot_bytes
+        header["latest"] = 0
+        del header
+        self._ring = _Ring(shm)
+
+    def close(self):
+        with self._lock:
+            if self._ring is None:
+                return
+            shm = self._ring.shm
+            self._ring.release()
+            self._ring = None
+            self.name = None
+            self.last_seq = 0
+            _retire(shm)
+            shm.close()
+            shm.unlink()
+
+
+class SharedFrameReader:
+    """
+    Attaches to the ring name (SharedFramePublisher.name) from any process.
+    Frames are zero-copy views into shared memory: they stay valid until the publisher wraps
+    around the ring, which is_valid() checks after the frame has been processed.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # python < 3.13: the resource tracker would unlink the publisher's ring when this process exits
+            shm = shared_memory.SharedMemory(name=name)
+            try:
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        self._ring = _Ring(shm)
+        if bytes(self._ring.header["magic"]) != MAGIC:
+            self.close()
+            raise ValueError(f"{name} is not a camera frame ring")
+
+    def latest_seq(self):
+        return int(self._ring.header["latest"])
+
+    def is_stale(self):
+        """True once the publisher has closed or replaced the ring, a new reader is needed then"""
+        return self._ring is None or bytes(self._ring.header["magic"]) != MAGIC
+
+    def read(self, seq=None):
+        """return the Frame with seq (default: the latest one), or None if it is not in the ring anymore"""
+        ring = self._ring
+        if seq is None:
+            seq = self.latest_seq()
+        if seq == 0:
+            return None
+        header = ring.slot_headers[seq % ring.slots]
+        if int(header["end"]) != seq or int(header["begin"]) != seq:
+            return None
+        ndim = int(header["ndim"])
+        shape = tuple(int(n) for n in header["shape"][:ndim])
+        dtype = np.dtype(bytes(header["dtype"]).decode("ascii"))
+        bayer = bytes(header["bayer"]).decode("ascii") or None
+        frame = Frame(ring.data(seq % ring.slots, dtype, shape), int(header["timestamp"]), float(header["host_timestamp"]),
+                      seq, int(header["dropped"]), int(header["bits"]), bayer)
+        # the slot may have been rewritten while the header was read
+        return frame if self.is_valid(frame) else None
+
+    def is_valid(self, frame):
+        return int(self._ring.slot_headers[frame.seq % self._ring.slots]["begin"]) == frame.seq
+
+    def close(self):
+        if self._ring is None:
+            return
+        shm = self._ring.shm
+        self._ring.release()
+        self._ring = None
+        try:
+            shm.close()
+        except BufferError:
+            pass  # frames handed out by read() still reference the mapping
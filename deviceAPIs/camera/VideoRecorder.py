@@ -0,0 +1,91 @@
+import queue
+import threading
+
+import cv2
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+from deviceAPIs.camera.PixelFormat import to_8bit
+
+
+class VideoRecorder(QObject):
+    """
+    Encodes camera frames into a video file with cv2.VideoWriter on a background thread.
+
+    As a camera sink it only queues the frame; when max_queue frames are already waiting the frame
+    is dropped and counted, so a slow codec never stalls the acquisition or the GUI.
+    High bit-depth frames are reduced to 8 bits, RGB frames are swapped to the BGR order OpenCV expects.
+    """
+    signal_finished = Signal(int)  # number of frames encoded
+    exception = Signal(str)
+
+    def __init__(self, path, fps=30.0, fourcc="mp4v", rgb=True, max_queue=16):
+        super().__init__()
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc
+        self.rgb = rgb
+        self.written = 0
+        self.dropped = 0  # frames refused because the encoder fell behind or the size changed
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._writer = None
+        self._size = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._encode_loop, name="video-recorder", daemon=True)
+        self._thread.start()
+
+    def __call__(self, frame):
+        if self._stopped:
+            return
+        if self._queue.full():
+            self.dropped += 1
+            return
+        # the copy releases the camera buffer at once, the encoder may lag behind by max_queue frames
+        self._queue.put(frame._replace(image=np.array(frame.image, copy=True)))
+
+    def backlog(self):
+        return self._queue.qsize()
+
+    def _encode_loop(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            try:
+                self._encode(frame)
+            except Exception as e:
+                self.dropped += 1
+                self.exception.emit(f"video recording {self.path} failed: {e}")
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+        self.signal_finished.emit(self.written)
+
+    def _encode(self, frame):
+        image = to_8bit(frame.image, frame.bits)
+        is_color = image.ndim == 3
+        if is_color and self.rgb:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        size = (image.shape[1], image.shape[0])
+
+        if self._writer is None:
+            self._writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, size, is_color)
+            if not self._writer.isOpened():
+                self._writer = None
+                raise IOError(f"cannot open a {self.fourcc} writer")
+            self._size = size
+        elif size != self._size:
+            self.dropped += 1
+            return
+        self._writer.write(np.ascontiguousarray(image))
+        self.written += 1
+
+    def close(self, wait=True):
+        """stop accepting frames, encode the queued ones and finalize the file"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
@@ -384,6 +384,29 @@ else:
         def __init__(self, hr):
             self.hr = hr
 
+class _BindingTable(dict):
+    '''records "table.Toupcam_xxx.restype = ..." style declarations without touching the library'''
+    def __getattr__(self, name):
+        return self.setdefault(name, _Binding())
+
+class _Binding:
+    pass
+
+class _LazyLib:
+    '''resolves a symbol of the shared library on first use, applies its declaration and caches it'''
+    def __init__(self, lib, table):
+        self._lib = lib
+        self._table = table
+
+    def __getattr__(self, name):
+        fun = getattr(self._lib, name)
+        binding = self._table.get(name)
+        if binding is not None:
+            for attr, value in vars(binding).items():
+                setattr(fun, attr, value)
+        setattr(self, name, fun)    # later lookups are plain instance attribute hits
+        return fun
+
 class _Resolution(ctypes.Structure):
     _fields_ = [('width', ctypes.c_uint),
                 ('height', ctypes.c_uint)]
@@ -452,6 +475,7 @@ class Toupcam:
         __PROGRESS_CALLBACK = ctypes.CFUNCTYPE(None, ctypes.c_int, ctypes.py_object)
         __HOTPLUG_CALLBACK = ctypes.CFUNCTYPE(None, ctypes.c_void_p)
         __hotplug = None
+        __hotplugCb = None
 
     __lib = None
     __progress = None
@@ -517,8 +541,11 @@ class Toupcam:
             cls.__hotplug = fun
             if cls.__hotplug is None:
                 cls.__lib.Toupcam_HotPlug(None, None)
+                cls.__hotplugCb = None
             else:
-                cls.__lib.Toupcam_HotPlug(cls.__HOTPLUG_CALLBACK(cls.__hotplugCallbackFun), None)
+                # keep a reference to the ctypes thunk, the library calls it long after this returns
+                cls.__hotplugCb = cls.__HOTPLUG_CALLBACK(cls.__hotplugCallbackFun)
+                cls.__lib.Toupcam_HotPlug(cls.__hotplugCb, None)
 
     @classmethod
     def EnumV2(cls):
@@ -608,16 +635,16 @@ class Toupcam:
         if pInfo is None:
             self.__lib.Toupcam_PullImageV2(self.__h, pImageData, bits, None)
         else:
-            x = __FrameInfoV2()
-            self.__lib.Toupcam_PullImageV2(self.__h, pImageData, bits, byref(x))
+            x = self.__FrameInfoV2()
+            self.__lib.Toupcam_PullImageV2(self.__h, pImageData, bits, ctypes.byref(x))
             self.__convertFrameInfo(pInfo, x)
 
     def PullStillImageV2(self, pImageData, bits, pInfo):
         if pInfo is None:
             self.__lib.Toupcam_PullStillImageV2(self.__h, pImageData, bits, None)
         else:
-            x = __FrameInfoV2()
-            self.__lib.Toupcam_PullStillImageV2(self.__h, pImageData, bits, byref(x))
+            x = self.__FrameInfoV2()
+            self.__lib.Toupcam_PullStillImageV2(self.__h, pImageData, bits, ctypes.byref(x))
             self.__convertFrameInfo(pInfo, x)
 
     def PullImageWithRowPitchV2(self, pImageData, bits, rowPitch, pInfo):
@@ -628,16 +655,28 @@ class Toupcam:
         if pInfo is None:
             self.__lib.Toupcam_PullImageWithRowPitchV2(self.__h, pImageData, bits, rowPitch, None)
         else:
-            x = __FrameInfoV2()
-            self.__lib.Toupcam_PullImageWithRowPitchV2(self.__h, pImageData, bits, rowPitch, byref(x))
+            x = self.__FrameInfoV2()
+            self.__lib.Toupcam_PullImageWithRowPitchV2(self.__h, pImageData, bits, rowPitch, ctypes.byref(x))
             self.__convertFrameInfo(pInfo, x)
 
+    def PullImageToArray(self, arr, bits, rowPitch, pInfo):
+        '''
+        pull the image straight into the memory of arr, a writable C-contiguous numpy array such as a frame pool slot
+        rowPitch: bytes from one row to the next inside arr, 0 means arr.strides[0]
+        the caller must make sure arr holds at least rowPitch * height bytes
+        '''
+        if not (arr.flags.c_contiguous and arr.flags.writeable):
+            raise HRESULTException(0x80070057)
+        if rowPitch == 0:
+            rowPitch = arr.strides[0]
+        self.PullImageWithRowPitchV2(arr.ctypes.data_as(ctypes.POINTER(ctypes.c_char)), bits, rowPitch, pInfo)
+
     def PullStillImageWithRowPitchV2(self, pImageData, bits, rowPitch, pInfo):
         if pInfo is None:
             self.__lib.Toupcam_PullStillImageWithRowPitchV2(self.__h, pImageData, bits, rowPitch, None)
         else:
-            x = __FrameInfoV2()
-            self.__lib.Toupcam_PullStillImageWithRowPitchV2(self.__h, pImageData, bits, rowPitch, pInfo)
+            x = self.__FrameInfoV2()
+            self.__lib.Toupcam_PullStillImageWithRowPitchV2(self.__h, pImageData, bits, rowPitch, ctypes.byref(x))
             self.__convertFrameInfo(pInfo, x)
 
     def ResolutionNumber(self):
@@ -1330,419 +1369,428 @@ class Toupcam:
     @classmethod
     def __initlib(cls):
         if cls.__lib is None:
+            lib = None
             try:
                 dir = os.path.dirname(os.path.realpath(__file__))
                 if sys.platform == 'win32':
-                    cls.__lib = ctypes.windll.LoadLibrary(os.path.join(dir, 'toupcam.dll'))
+                    lib = ctypes.windll.LoadLibrary(os.path.join(dir, 'toupcam.dll'))
                 elif sys.platform.startswith('linux'):
-                    cls.__lib = ctypes.cdll.LoadLibrary(os.path.join(dir, 'libtoupcam.so'))
+                    lib = ctypes.cdll.LoadLibrary(os.path.join(dir, 'libtoupcam.so'))
                 else:
-                    cls.__lib = ctypes.cdll.LoadLibrary(os.path.join(dir, 'libtoupcam.dylib'))
+                    lib = ctypes.cdll.LoadLibrary(os.path.join(dir, 'libtoupcam.dylib'))
             except OSError:
                 pass
 
-            if cls.__lib is None:
+            if lib is None:
                 if sys.platform == 'win32':
-                    cls.__lib = ctypes.windll.LoadLibrary('toupcam.dll')
+                    lib = ctypes.windll.LoadLibrary('toupcam.dll')
                 elif sys.platform.startswith('linux'):
-                    cls.__lib = ctypes.cdll.LoadLibrary('libtoupcam.so')
+                    lib = ctypes.cdll.LoadLibrary('libtoupcam.so')
                 else:
-                    cls.__lib = ctypes.cdll.LoadLibrary('libtoupcam.dylib')
-
-            cls.__lib.Toupcam_Version.argtypes = None
-            cls.__lib.Toupcam_EnumV2.restype = ctypes.c_uint
-            cls.__lib.Toupcam_EnumV2.argtypes = [_DeviceV2 * TOUPCAM_MAX]
-            cls.__lib.Toupcam_Open.restype = ctypes.c_void_p
-            cls.__lib.Toupcam_Replug.restype = ctypes.c_int
-            cls.__lib.Toupcam_Update.restype = ctypes.c_int
-            if sys.platform == 'win32':
-                cls.__lib.Toupcam_Version.restype = ctypes.c_wchar_p
-                cls.__lib.Toupcam_Open.argtypes = [ctypes.c_wchar_p]
-                cls.__lib.Toupcam_Replug.argtypes = [ctypes.c_wchar_p]
-                cls.__lib.Toupcam_Update.argtypes = [ctypes.c_wchar_p, ctypes.c_wchar_p, cls.__PROGRESS_CALLBACK, ctypes.py_object]
-            else:
-                cls.__lib.Toupcam_Version.restype = ctypes.c_char_p
-                cls.__lib.Toupcam_Open.argtypes = [ctypes.c_char_p]
-                cls.__lib.Toupcam_Replug.argtypes = [ctypes.c_char_p]
-                cls.__lib.Toupcam_Update.argtypes = [ctypes.c_char_p, ctypes.c_char_p, cls.__PROGRESS_CALLBACK, ctypes.py_object]
-            cls.__lib.Toupcam_Replug.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_Update.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_OpenByIndex.restype = ctypes.c_void_p
-            cls.__lib.Toupcam_OpenByIndex.argtypes = [ctypes.c_uint]
-            cls.__lib.Toupcam_Close.restype = None
-            cls.__lib.Toupcam_Close.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_StartPullModeWithCallback.restype = ctypes.c_int
-            cls.__lib.Toupcam_StartPullModeWithCallback.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_StartPullModeWithCallback.argtypes = [ctypes.c_void_p, cls.__EVENT_CALLBACK, ctypes.py_object]
-            cls.__lib.Toupcam_PullImageV2.restype = ctypes.c_int
-            cls.__lib.Toupcam_PullImageV2.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_PullImageV2.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(cls.__FrameInfoV2)]
-            cls.__lib.Toupcam_PullStillImageV2.restype = ctypes.c_int
-            cls.__lib.Toupcam_PullStillImageV2.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_PullStillImageV2.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(cls.__FrameInfoV2)]
-            cls.__lib.Toupcam_PullImageWithRowPitchV2.restype = ctypes.c_int
-            cls.__lib.Toupcam_PullImageWithRowPitchV2.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_PullImageWithRowPitchV2.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.c_int, ctypes.POINTER(cls.__FrameInfoV2)]
-            cls.__lib.Toupcam_PullStillImageWithRowPitchV2.restype = ctypes.c_int
-            cls.__lib.Toupcam_PullStillImageWithRowPitchV2.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_PullStillImageWithRowPitchV2.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.c_int, ctypes.POINTER(cls.__FrameInfoV2)]
-            cls.__lib.Toupcam_Stop.restype = ctypes.c_int
-            cls.__lib.Toupcam_Stop.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_Stop.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_Pause.restype = ctypes.c_int
-            cls.__lib.Toupcam_Pause.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_Pause.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_Snap.restype = ctypes.c_int
-            cls.__lib.Toupcam_Snap.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_Snap.argtypes = [ctypes.c_void_p, ctypes.c_uint]
-            cls.__lib.Toupcam_SnapN.restype = ctypes.c_int
-            cls.__lib.Toupcam_SnapN.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_SnapN.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint]
-            cls.__lib.Toupcam_Trigger.restype = ctypes.c_int
-            cls.__lib.Toupcam_Trigger.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_Trigger.argtypes = [ctypes.c_void_p, ctypes.c_ushort]
-            cls.__lib.Toupcam_put_Size.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Size.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Size.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
-            cls.__lib.Toupcam_get_Size.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Size.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Size.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_eSize.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_eSize.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_eSize.argtypes = [ctypes.c_void_p, ctypes.c_uint]
-            cls.__lib.Toupcam_get_eSize.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_eSize.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_eSize.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint)]
-            cls.__lib.Toupcam_get_FinalSize.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_FinalSize.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_FinalSize.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_get_ResolutionNumber.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_ResolutionNumber.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_ResolutionNumber.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_get_Resolution.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Resolution.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Resolution.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)];
-            cls.__lib.Toupcam_get_ResolutionRatio.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_ResolutionRatio.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_ResolutionRatio.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)];
-            cls.__lib.Toupcam_get_Field.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Field.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Field.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_get_RawFormat.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_RawFormat.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_RawFormat.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint)]
-            cls.__lib.Toupcam_get_AutoExpoEnable.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_AutoExpoEnable.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_AutoExpoEnable.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_AutoExpoEnable.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_AutoExpoEnable.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_AutoExpoEnable.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_AutoExpoTarget.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_AutoExpoTarget.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_AutoExpoTarget.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort)]
-            cls.__lib.Toupcam_put_AutoExpoTarget.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_AutoExpoTarget.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_AutoExpoTarget.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_put_MaxAutoExpoTimeAGain.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_MaxAutoExpoTimeAGain.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_MaxAutoExpoTimeAGain.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_ushort]
-            cls.__lib.Toupcam_get_MaxAutoExpoTimeAGain.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_MaxAutoExpoTimeAGain.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_MaxAutoExpoTimeAGain.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_ushort)]
-            cls.__lib.Toupcam_put_MinAutoExpoTimeAGain.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_MinAutoExpoTimeAGain.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_MinAutoExpoTimeAGain.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_ushort]
-            cls.__lib.Toupcam_get_MinAutoExpoTimeAGain.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_MinAutoExpoTimeAGain.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_MinAutoExpoTimeAGain.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_ushort)]
-            cls.__lib.Toupcam_put_ExpoTime.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_ExpoTime.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_ExpoTime.argtypes = [ctypes.c_void_p, ctypes.c_uint]
-            cls.__lib.Toupcam_get_ExpoTime.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_ExpoTime.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_ExpoTime.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint)]
-            cls.__lib.Toupcam_get_RealExpoTime.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_RealExpoTime.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_RealExpoTime.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint)]
-            cls.__lib.Toupcam_get_ExpTimeRange.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_ExpTimeRange.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_ExpTimeRange.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint)]
-            cls.__lib.Toupcam_put_ExpoAGain.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_ExpoAGain.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_ExpoAGain.argtypes = [ctypes.c_void_p, ctypes.c_ushort]
-            cls.__lib.Toupcam_get_ExpoAGain.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_ExpoAGain.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_ExpoAGain.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort)]
-            cls.__lib.Toupcam_get_ExpoAGainRange.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_ExpoAGainRange.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_ExpoAGainRange.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort), ctypes.POINTER(ctypes.c_ushort), ctypes.POINTER(ctypes.c_ushort)]
-            cls.__lib.Toupcam_AwbOnce.restype = ctypes.c_int
-            cls.__lib.Toupcam_AwbOnce.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_AwbOnce.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
-            cls.__lib.Toupcam_AwbInit.restype = ctypes.c_int
-            cls.__lib.Toupcam_AwbInit.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_AwbInit.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
-            cls.__lib.Toupcam_put_TempTint.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_TempTint.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_TempTint.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
-            cls.__lib.Toupcam_get_TempTint.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_TempTint.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_TempTint.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_WhiteBalanceGain.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_WhiteBalanceGain.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_WhiteBalanceGain.argtypes = [ctypes.c_void_p, (ctypes.c_int * 3)]
-            cls.__lib.Toupcam_get_WhiteBalanceGain.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_WhiteBalanceGain.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_WhiteBalanceGain.argtypes = [ctypes.c_void_p, (ctypes.c_int * 3)]
-            cls.__lib.Toupcam_put_BlackBalance.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_BlackBalance.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_BlackBalance.argtypes = [ctypes.c_void_p, (ctypes.c_int * 3)]
-            cls.__lib.Toupcam_get_BlackBalance.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_BlackBalance.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_BlackBalance.argtypes = [ctypes.c_void_p, (ctypes.c_int * 3)]
-            cls.__lib.Toupcam_AbbOnce.restype = ctypes.c_int
-            cls.__lib.Toupcam_AbbOnce.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_AbbOnce.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
-            cls.__lib.Toupcam_FfcOnce.restype = ctypes.c_int
-            cls.__lib.Toupcam_FfcOnce.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_FfcOnce.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_DfcOnce.restype = ctypes.c_int
-            cls.__lib.Toupcam_DfcOnce.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_DfcOnce.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_FfcExport.restype = ctypes.c_int
-            cls.__lib.Toupcam_FfcExport.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_FfcImport.restype = ctypes.c_int
-            cls.__lib.Toupcam_FfcImport.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_DfcExport.restype = ctypes.c_int
-            cls.__lib.Toupcam_DfcExport.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_DfcImport.restype = ctypes.c_int
-            cls.__lib.Toupcam_DfcImport.errcheck = cls.__errcheck
-            if sys.platform == 'win32':
-                cls.__lib.Toupcam_FfcExport.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p]
-                cls.__lib.Toupcam_FfcImport.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p]
-                cls.__lib.Toupcam_DfcExport.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p]
-                cls.__lib.Toupcam_DfcImport.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p]
-            else:
-                cls.__lib.Toupcam_FfcExport.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
-                cls.__lib.Toupcam_FfcImport.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
-                cls.__lib.Toupcam_DfcExport.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
-                cls.__lib.Toupcam_DfcImport.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
-            cls.__lib.Toupcam_put_Hue.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Hue.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Hue.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_Hue.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Hue.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Hue.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_Saturation.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Saturation.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Saturation.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_Saturation.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Saturation.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Saturation.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_Brightness.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Brightness.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Brightness.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_Brightness.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Brightness.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Brightness.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_Contrast.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Contrast.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Contrast.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_Contrast.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Contrast.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Contrast.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_Gamma.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Gamma.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Gamma.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_Gamma.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Gamma.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Gamma.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_Chrome.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Chrome.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Chrome.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_Chrome.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Chrome.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Chrome.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_VFlip.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_VFlip.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_VFlip.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_VFlip.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_VFlip.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_VFlip.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_HFlip.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_HFlip.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_HFlip.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_HFlip.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_HFlip.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_HFlip.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_Negative.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Negative.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Negative.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_Negative.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Negative.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Negative.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_Speed.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Speed.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Speed.argtypes = [ctypes.c_void_p, ctypes.c_ushort]
-            cls.__lib.Toupcam_get_Speed.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Speed.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Speed.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort)]
-            cls.__lib.Toupcam_get_MaxSpeed.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_MaxSpeed.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_MaxSpeed.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_get_FanMaxSpeed.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_FanMaxSpeed.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_FanMaxSpeed.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_get_MaxBitDepth.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_MaxBitDepth.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_MaxBitDepth.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_put_HZ.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_HZ.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_HZ.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_HZ.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_HZ.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_HZ.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_Mode.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Mode.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Mode.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_Mode.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Mode.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Mode.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_AWBAuxRect.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_AWBAuxRect.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_AWBAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
-            cls.__lib.Toupcam_get_AWBAuxRect.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_AWBAuxRect.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_AWBAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
-            cls.__lib.Toupcam_put_AEAuxRect.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_AEAuxRect.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_AEAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
-            cls.__lib.Toupcam_get_AEAuxRect.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_AEAuxRect.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_AEAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
-            cls.__lib.Toupcam_put_ABBAuxRect.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_ABBAuxRect.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_ABBAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
-            cls.__lib.Toupcam_get_ABBAuxRect.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_ABBAuxRect.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_ABBAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
-            cls.__lib.Toupcam_get_MonoMode.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_MonoMode.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_MonoMode.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_get_StillResolutionNumber.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_StillResolutionNumber.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_StillResolutionNumber.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_get_StillResolution.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_StillResolution.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_StillResolution.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_RealTime.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_RealTime.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_RealTime.argtypes = [ctypes.c_void_p, ctypes.c_int]
-            cls.__lib.Toupcam_get_RealTime.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_RealTime.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_RealTime.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_Flush.restype = ctypes.c_int
-            cls.__lib.Toupcam_Flush.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_Flush.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_put_Temperature.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Temperature.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Temperature.argtypes = [ctypes.c_void_p, ctypes.c_ushort]
-            cls.__lib.Toupcam_get_Temperature.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Temperature.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Temperature.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort)]
-            cls.__lib.Toupcam_get_Revision.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Revision.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Revision.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort)]
-            cls.__lib.Toupcam_get_SerialNumber.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_SerialNumber.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_SerialNumber.argtypes = [ctypes.c_void_p, ctypes.c_char * 32]
-            cls.__lib.Toupcam_get_FwVersion.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_FwVersion.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_FwVersion.argtypes = [ctypes.c_void_p, ctypes.c_char * 16]
-            cls.__lib.Toupcam_get_HwVersion.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_HwVersion.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_HwVersion.argtypes = [ctypes.c_void_p, ctypes.c_char * 16]
-            cls.__lib.Toupcam_get_ProductionDate.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_ProductionDate.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_ProductionDate.argtypes = [ctypes.c_void_p, ctypes.c_char * 16]
-            cls.__lib.Toupcam_get_FpgaVersion.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_FpgaVersion.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_FpgaVersion.argtypes = [ctypes.c_void_p, ctypes.c_char * 16]
-            cls.__lib.Toupcam_get_PixelSize.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_PixelSize.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_PixelSize.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_float), ctypes.POINTER(ctypes.c_float)]
-            cls.__lib.Toupcam_put_LevelRange.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_LevelRange.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_LevelRange.argtypes = [ctypes.c_void_p, (ctypes.c_ushort * 4), (ctypes.c_ushort * 4)]
-            cls.__lib.Toupcam_get_LevelRange.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_LevelRange.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_LevelRange.argtypes = [ctypes.c_void_p, (ctypes.c_ushort * 4), (ctypes.c_ushort * 4)]
-            cls.__lib.Toupcam_put_LevelRangeV2.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_LevelRangeV2.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_LevelRangeV2.argtypes = [ctypes.c_void_p, ctypes.c_ushort, ctypes.POINTER(cls.__RECT), (ctypes.c_ushort * 4), (ctypes.c_ushort * 4)]
-            cls.__lib.Toupcam_get_LevelRangeV2.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_LevelRangeV2.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_LevelRangeV2.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort), ctypes.POINTER(cls.__RECT), (ctypes.c_ushort * 4), (ctypes.c_ushort * 4)]
-            cls.__lib.Toupcam_LevelRangeAuto.restype = ctypes.c_int
-            cls.__lib.Toupcam_LevelRangeAuto.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_LevelRangeAuto.argtypes = [ctypes.c_void_p]
-            cls.__lib.Toupcam_put_LEDState.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_LEDState.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_LEDState.argtypes = [ctypes.c_void_p, ctypes.c_ushort, ctypes.c_ushort, ctypes.c_ushort, ctypes.c_ushort]
-            cls.__lib.Toupcam_write_EEPROM.restype = ctypes.c_int
-            cls.__lib.Toupcam_write_EEPROM.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_write_EEPROM.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_char_p, ctypes.c_uint]
-            cls.__lib.Toupcam_read_EEPROM.restype = ctypes.c_int
-            cls.__lib.Toupcam_read_EEPROM.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_read_EEPROM.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_char_p, ctypes.c_uint]
-            cls.__lib.Toupcam_read_Pipe.restype = ctypes.c_int
-            cls.__lib.Toupcam_read_Pipe.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_read_Pipe.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_char_p, ctypes.c_uint]
-            cls.__lib.Toupcam_write_Pipe.restype = ctypes.c_int
-            cls.__lib.Toupcam_write_Pipe.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_write_Pipe.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_char_p, ctypes.c_uint]
-            cls.__lib.Toupcam_feed_Pipe.restype = ctypes.c_int
-            cls.__lib.Toupcam_feed_Pipe.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_feed_Pipe.argtypes = [ctypes.c_void_p, ctypes.c_uint]
-            cls.__lib.Toupcam_put_Option.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Option.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Option.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
-            cls.__lib.Toupcam_get_Option.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Option.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Option.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_put_Roi.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Roi.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Roi.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint, ctypes.c_uint, ctypes.c_uint]
-            cls.__lib.Toupcam_get_Roi.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_Roi.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_Roi.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint)]
-            cls.__lib.Toupcam_get_AfParam.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_AfParam.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_AfParam.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__AfParam)]
-            cls.__lib.Toupcam_IoControl.restype = ctypes.c_int
-            cls.__lib.Toupcam_IoControl.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_IoControl.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
-            cls.__lib.Toupcam_read_UART.restype = ctypes.c_int
-            cls.__lib.Toupcam_read_UART.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_read_UART.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint]
-            cls.__lib.Toupcam_write_UART.restype = ctypes.c_int
-            cls.__lib.Toupcam_write_UART.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_write_UART.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint]
-            cls.__lib.Toupcam_put_Linear.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Linear.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Linear.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ushort)]
-            cls.__lib.Toupcam_put_Curve.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_Curve.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_Curve.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ushort)]
-            cls.__lib.Toupcam_put_ColorMatrix.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_ColorMatrix.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_ColorMatrix.argtypes = [ctypes.c_void_p, ctypes.c_double * 9]
-            cls.__lib.Toupcam_put_InitWBGain.restype = ctypes.c_int
-            cls.__lib.Toupcam_put_InitWBGain.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_put_InitWBGain.argtypes = [ctypes.c_void_p, ctypes.c_ushort * 3]
-            cls.__lib.Toupcam_get_FrameRate.restype = ctypes.c_int
-            cls.__lib.Toupcam_get_FrameRate.errcheck = cls.__errcheck
-            cls.__lib.Toupcam_get_FrameRate.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint)]
-            if sys.platform != 'win32':
-                cls.__lib.Toupcam_HotPlug.restype = None
-                cls.__lib.Toupcam_HotPlug.argtypes = [cls.__HOTPLUG_CALLBACK, ctypes.c_void_p]
\ No newline at end of file
+                    lib = ctypes.cdll.LoadLibrary('libtoupcam.dylib')
+
+            # symbols are looked up and typed on first use, a script that only calls EnumV2 binds a handful of them
+            cls.__lib = _LazyLib(lib, cls.__bindings())
+
+    @classmethod
+    def __bindings(cls):
+        '''restype, argtypes and errcheck of every entry point, keyed by symbol name'''
+        spec = _BindingTable()
+        spec.Toupcam_Version.argtypes = None
+        spec.Toupcam_EnumV2.restype = ctypes.c_uint
+        spec.Toupcam_EnumV2.argtypes = [_DeviceV2 * TOUPCAM_MAX]
+        spec.Toupcam_Open.restype = ctypes.c_void_p
+        spec.Toupcam_Replug.restype = ctypes.c_int
+        spec.Toupcam_Update.restype = ctypes.c_int
+        if sys.platform == 'win32':
+            spec.Toupcam_Version.restype = ctypes.c_wchar_p
+            spec.Toupcam_Open.argtypes = [ctypes.c_wchar_p]
+            spec.Toupcam_Replug.argtypes = [ctypes.c_wchar_p]
+            spec.Toupcam_Update.argtypes = [ctypes.c_wchar_p, ctypes.c_wchar_p, cls.__PROGRESS_CALLBACK, ctypes.py_object]
+        else:
+            spec.Toupcam_Version.restype = ctypes.c_char_p
+            spec.Toupcam_Open.argtypes = [ctypes.c_char_p]
+            spec.Toupcam_Replug.argtypes = [ctypes.c_char_p]
+            spec.Toupcam_Update.argtypes = [ctypes.c_char_p, ctypes.c_char_p, cls.__PROGRESS_CALLBACK, ctypes.py_object]
+        spec.Toupcam_Replug.errcheck = cls.__errcheck
+        spec.Toupcam_Update.errcheck = cls.__errcheck
+        spec.Toupcam_OpenByIndex.restype = ctypes.c_void_p
+        spec.Toupcam_OpenByIndex.argtypes = [ctypes.c_uint]
+        spec.Toupcam_Close.restype = None
+        spec.Toupcam_Close.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_StartPullModeWithCallback.restype = ctypes.c_int
+        spec.Toupcam_StartPullModeWithCallback.errcheck = cls.__errcheck
+        spec.Toupcam_StartPullModeWithCallback.argtypes = [ctypes.c_void_p, cls.__EVENT_CALLBACK, ctypes.py_object]
+        spec.Toupcam_PullImageV2.restype = ctypes.c_int
+        spec.Toupcam_PullImageV2.errcheck = cls.__errcheck
+        spec.Toupcam_PullImageV2.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(cls.__FrameInfoV2)]
+        spec.Toupcam_PullStillImageV2.restype = ctypes.c_int
+        spec.Toupcam_PullStillImageV2.errcheck = cls.__errcheck
+        spec.Toupcam_PullStillImageV2.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(cls.__FrameInfoV2)]
+        spec.Toupcam_PullImageWithRowPitchV2.restype = ctypes.c_int
+        spec.Toupcam_PullImageWithRowPitchV2.errcheck = cls.__errcheck
+        spec.Toupcam_PullImageWithRowPitchV2.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.c_int, ctypes.POINTER(cls.__FrameInfoV2)]
+        spec.Toupcam_PullStillImageWithRowPitchV2.restype = ctypes.c_int
+        spec.Toupcam_PullStillImageWithRowPitchV2.errcheck = cls.__errcheck
+        spec.Toupcam_PullStillImageWithRowPitchV2.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int, ctypes.c_int, ctypes.POINTER(cls.__FrameInfoV2)]
+        spec.Toupcam_Stop.restype = ctypes.c_int
+        spec.Toupcam_Stop.errcheck = cls.__errcheck
+        spec.Toupcam_Stop.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_Pause.restype = ctypes.c_int
+        spec.Toupcam_Pause.errcheck = cls.__errcheck
+        spec.Toupcam_Pause.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_Snap.restype = ctypes.c_int
+        spec.Toupcam_Snap.errcheck = cls.__errcheck
+        spec.Toupcam_Snap.argtypes = [ctypes.c_void_p, ctypes.c_uint]
+        spec.Toupcam_SnapN.restype = ctypes.c_int
+        spec.Toupcam_SnapN.errcheck = cls.__errcheck
+        spec.Toupcam_SnapN.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint]
+        spec.Toupcam_Trigger.restype = ctypes.c_int
+        spec.Toupcam_Trigger.errcheck = cls.__errcheck
+        spec.Toupcam_Trigger.argtypes = [ctypes.c_void_p, ctypes.c_ushort]
+        spec.Toupcam_put_Size.restype = ctypes.c_int
+        spec.Toupcam_put_Size.errcheck = cls.__errcheck
+        spec.Toupcam_put_Size.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
+        spec.Toupcam_get_Size.restype = ctypes.c_int
+        spec.Toupcam_get_Size.errcheck = cls.__errcheck
+        spec.Toupcam_get_Size.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_eSize.restype = ctypes.c_int
+        spec.Toupcam_put_eSize.errcheck = cls.__errcheck
+        spec.Toupcam_put_eSize.argtypes = [ctypes.c_void_p, ctypes.c_uint]
+        spec.Toupcam_get_eSize.restype = ctypes.c_int
+        spec.Toupcam_get_eSize.errcheck = cls.__errcheck
+        spec.Toupcam_get_eSize.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint)]
+        spec.Toupcam_get_FinalSize.restype = ctypes.c_int
+        spec.Toupcam_get_FinalSize.errcheck = cls.__errcheck
+        spec.Toupcam_get_FinalSize.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_get_ResolutionNumber.restype = ctypes.c_int
+        spec.Toupcam_get_ResolutionNumber.errcheck = cls.__errcheck
+        spec.Toupcam_get_ResolutionNumber.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_get_Resolution.restype = ctypes.c_int
+        spec.Toupcam_get_Resolution.errcheck = cls.__errcheck
+        spec.Toupcam_get_Resolution.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)];
+        spec.Toupcam_get_ResolutionRatio.restype = ctypes.c_int
+        spec.Toupcam_get_ResolutionRatio.errcheck = cls.__errcheck
+        spec.Toupcam_get_ResolutionRatio.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)];
+        spec.Toupcam_get_Field.restype = ctypes.c_int
+        spec.Toupcam_get_Field.errcheck = cls.__errcheck
+        spec.Toupcam_get_Field.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_get_RawFormat.restype = ctypes.c_int
+        spec.Toupcam_get_RawFormat.errcheck = cls.__errcheck
+        spec.Toupcam_get_RawFormat.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint)]
+        spec.Toupcam_get_AutoExpoEnable.restype = ctypes.c_int
+        spec.Toupcam_get_AutoExpoEnable.errcheck = cls.__errcheck
+        spec.Toupcam_get_AutoExpoEnable.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_AutoExpoEnable.restype = ctypes.c_int
+        spec.Toupcam_put_AutoExpoEnable.errcheck = cls.__errcheck
+        spec.Toupcam_put_AutoExpoEnable.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_AutoExpoTarget.restype = ctypes.c_int
+        spec.Toupcam_get_AutoExpoTarget.errcheck = cls.__errcheck
+        spec.Toupcam_get_AutoExpoTarget.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort)]
+        spec.Toupcam_put_AutoExpoTarget.restype = ctypes.c_int
+        spec.Toupcam_put_AutoExpoTarget.errcheck = cls.__errcheck
+        spec.Toupcam_put_AutoExpoTarget.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_put_MaxAutoExpoTimeAGain.restype = ctypes.c_int
+        spec.Toupcam_put_MaxAutoExpoTimeAGain.errcheck = cls.__errcheck
+        spec.Toupcam_put_MaxAutoExpoTimeAGain.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_ushort]
+        spec.Toupcam_get_MaxAutoExpoTimeAGain.restype = ctypes.c_int
+        spec.Toupcam_get_MaxAutoExpoTimeAGain.errcheck = cls.__errcheck
+        spec.Toupcam_get_MaxAutoExpoTimeAGain.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_ushort)]
+        spec.Toupcam_put_MinAutoExpoTimeAGain.restype = ctypes.c_int
+        spec.Toupcam_put_MinAutoExpoTimeAGain.errcheck = cls.__errcheck
+        spec.Toupcam_put_MinAutoExpoTimeAGain.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_ushort]
+        spec.Toupcam_get_MinAutoExpoTimeAGain.restype = ctypes.c_int
+        spec.Toupcam_get_MinAutoExpoTimeAGain.errcheck = cls.__errcheck
+        spec.Toupcam_get_MinAutoExpoTimeAGain.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_ushort)]
+        spec.Toupcam_put_ExpoTime.restype = ctypes.c_int
+        spec.Toupcam_put_ExpoTime.errcheck = cls.__errcheck
+        spec.Toupcam_put_ExpoTime.argtypes = [ctypes.c_void_p, ctypes.c_uint]
+        spec.Toupcam_get_ExpoTime.restype = ctypes.c_int
+        spec.Toupcam_get_ExpoTime.errcheck = cls.__errcheck
+        spec.Toupcam_get_ExpoTime.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint)]
+        spec.Toupcam_get_RealExpoTime.restype = ctypes.c_int
+        spec.Toupcam_get_RealExpoTime.errcheck = cls.__errcheck
+        spec.Toupcam_get_RealExpoTime.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint)]
+        spec.Toupcam_get_ExpTimeRange.restype = ctypes.c_int
+        spec.Toupcam_get_ExpTimeRange.errcheck = cls.__errcheck
+        spec.Toupcam_get_ExpTimeRange.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint)]
+        spec.Toupcam_put_ExpoAGain.restype = ctypes.c_int
+        spec.Toupcam_put_ExpoAGain.errcheck = cls.__errcheck
+        spec.Toupcam_put_ExpoAGain.argtypes = [ctypes.c_void_p, ctypes.c_ushort]
+        spec.Toupcam_get_ExpoAGain.restype = ctypes.c_int
+        spec.Toupcam_get_ExpoAGain.errcheck = cls.__errcheck
+        spec.Toupcam_get_ExpoAGain.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort)]
+        spec.Toupcam_get_ExpoAGainRange.restype = ctypes.c_int
+        spec.Toupcam_get_ExpoAGainRange.errcheck = cls.__errcheck
+        spec.Toupcam_get_ExpoAGainRange.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort), ctypes.POINTER(ctypes.c_ushort), ctypes.POINTER(ctypes.c_ushort)]
+        spec.Toupcam_AwbOnce.restype = ctypes.c_int
+        spec.Toupcam_AwbOnce.errcheck = cls.__errcheck
+        spec.Toupcam_AwbOnce.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+        spec.Toupcam_AwbInit.restype = ctypes.c_int
+        spec.Toupcam_AwbInit.errcheck = cls.__errcheck
+        spec.Toupcam_AwbInit.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+        spec.Toupcam_put_TempTint.restype = ctypes.c_int
+        spec.Toupcam_put_TempTint.errcheck = cls.__errcheck
+        spec.Toupcam_put_TempTint.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
+        spec.Toupcam_get_TempTint.restype = ctypes.c_int
+        spec.Toupcam_get_TempTint.errcheck = cls.__errcheck
+        spec.Toupcam_get_TempTint.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_WhiteBalanceGain.restype = ctypes.c_int
+        spec.Toupcam_put_WhiteBalanceGain.errcheck = cls.__errcheck
+        spec.Toupcam_put_WhiteBalanceGain.argtypes = [ctypes.c_void_p, (ctypes.c_int * 3)]
+        spec.Toupcam_get_WhiteBalanceGain.restype = ctypes.c_int
+        spec.Toupcam_get_WhiteBalanceGain.errcheck = cls.__errcheck
+        spec.Toupcam_get_WhiteBalanceGain.argtypes = [ctypes.c_void_p, (ctypes.c_int * 3)]
+        spec.Toupcam_put_BlackBalance.restype = ctypes.c_int
+        spec.Toupcam_put_BlackBalance.errcheck = cls.__errcheck
+        spec.Toupcam_put_BlackBalance.argtypes = [ctypes.c_void_p, (ctypes.c_int * 3)]
+        spec.Toupcam_get_BlackBalance.restype = ctypes.c_int
+        spec.Toupcam_get_BlackBalance.errcheck = cls.__errcheck
+        spec.Toupcam_get_BlackBalance.argtypes = [ctypes.c_void_p, (ctypes.c_int * 3)]
+        spec.Toupcam_AbbOnce.restype = ctypes.c_int
+        spec.Toupcam_AbbOnce.errcheck = cls.__errcheck
+        spec.Toupcam_AbbOnce.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+        spec.Toupcam_FfcOnce.restype = ctypes.c_int
+        spec.Toupcam_FfcOnce.errcheck = cls.__errcheck
+        spec.Toupcam_FfcOnce.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_DfcOnce.restype = ctypes.c_int
+        spec.Toupcam_DfcOnce.errcheck = cls.__errcheck
+        spec.Toupcam_DfcOnce.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_FfcExport.restype = ctypes.c_int
+        spec.Toupcam_FfcExport.errcheck = cls.__errcheck
+        spec.Toupcam_FfcImport.restype = ctypes.c_int
+        spec.Toupcam_FfcImport.errcheck = cls.__errcheck
+        spec.Toupcam_DfcExport.restype = ctypes.c_int
+        spec.Toupcam_DfcExport.errcheck = cls.__errcheck
+        spec.Toupcam_DfcImport.restype = ctypes.c_int
+        spec.Toupcam_DfcImport.errcheck = cls.__errcheck
+        if sys.platform == 'win32':
+            spec.Toupcam_FfcExport.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p]
+            spec.Toupcam_FfcImport.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p]
+            spec.Toupcam_DfcExport.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p]
+            spec.Toupcam_DfcImport.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p]
+        else:
+            spec.Toupcam_FfcExport.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+            spec.Toupcam_FfcImport.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+            spec.Toupcam_DfcExport.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+            spec.Toupcam_DfcImport.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+        spec.Toupcam_put_Hue.restype = ctypes.c_int
+        spec.Toupcam_put_Hue.errcheck = cls.__errcheck
+        spec.Toupcam_put_Hue.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_Hue.restype = ctypes.c_int
+        spec.Toupcam_get_Hue.errcheck = cls.__errcheck
+        spec.Toupcam_get_Hue.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_Saturation.restype = ctypes.c_int
+        spec.Toupcam_put_Saturation.errcheck = cls.__errcheck
+        spec.Toupcam_put_Saturation.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_Saturation.restype = ctypes.c_int
+        spec.Toupcam_get_Saturation.errcheck = cls.__errcheck
+        spec.Toupcam_get_Saturation.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_Brightness.restype = ctypes.c_int
+        spec.Toupcam_put_Brightness.errcheck = cls.__errcheck
+        spec.Toupcam_put_Brightness.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_Brightness.restype = ctypes.c_int
+        spec.Toupcam_get_Brightness.errcheck = cls.__errcheck
+        spec.Toupcam_get_Brightness.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_Contrast.restype = ctypes.c_int
+        spec.Toupcam_put_Contrast.errcheck = cls.__errcheck
+        spec.Toupcam_put_Contrast.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_Contrast.restype = ctypes.c_int
+        spec.Toupcam_get_Contrast.errcheck = cls.__errcheck
+        spec.Toupcam_get_Contrast.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_Gamma.restype = ctypes.c_int
+        spec.Toupcam_put_Gamma.errcheck = cls.__errcheck
+        spec.Toupcam_put_Gamma.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_Gamma.restype = ctypes.c_int
+        spec.Toupcam_get_Gamma.errcheck = cls.__errcheck
+        spec.Toupcam_get_Gamma.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_Chrome.restype = ctypes.c_int
+        spec.Toupcam_put_Chrome.errcheck = cls.__errcheck
+        spec.Toupcam_put_Chrome.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_Chrome.restype = ctypes.c_int
+        spec.Toupcam_get_Chrome.errcheck = cls.__errcheck
+        spec.Toupcam_get_Chrome.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_VFlip.restype = ctypes.c_int
+        spec.Toupcam_put_VFlip.errcheck = cls.__errcheck
+        spec.Toupcam_put_VFlip.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_VFlip.restype = ctypes.c_int
+        spec.Toupcam_get_VFlip.errcheck = cls.__errcheck
+        spec.Toupcam_get_VFlip.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_HFlip.restype = ctypes.c_int
+        spec.Toupcam_put_HFlip.errcheck = cls.__errcheck
+        spec.Toupcam_put_HFlip.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_HFlip.restype = ctypes.c_int
+        spec.Toupcam_get_HFlip.errcheck = cls.__errcheck
+        spec.Toupcam_get_HFlip.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_Negative.restype = ctypes.c_int
+        spec.Toupcam_put_Negative.errcheck = cls.__errcheck
+        spec.Toupcam_put_Negative.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_Negative.restype = ctypes.c_int
+        spec.Toupcam_get_Negative.errcheck = cls.__errcheck
+        spec.Toupcam_get_Negative.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_Speed.restype = ctypes.c_int
+        spec.Toupcam_put_Speed.errcheck = cls.__errcheck
+        spec.Toupcam_put_Speed.argtypes = [ctypes.c_void_p, ctypes.c_ushort]
+        spec.Toupcam_get_Speed.restype = ctypes.c_int
+        spec.Toupcam_get_Speed.errcheck = cls.__errcheck
+        spec.Toupcam_get_Speed.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort)]
+        spec.Toupcam_get_MaxSpeed.restype = ctypes.c_int
+        spec.Toupcam_get_MaxSpeed.errcheck = cls.__errcheck
+        spec.Toupcam_get_MaxSpeed.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_get_FanMaxSpeed.restype = ctypes.c_int
+        spec.Toupcam_get_FanMaxSpeed.errcheck = cls.__errcheck
+        spec.Toupcam_get_FanMaxSpeed.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_get_MaxBitDepth.restype = ctypes.c_int
+        spec.Toupcam_get_MaxBitDepth.errcheck = cls.__errcheck
+        spec.Toupcam_get_MaxBitDepth.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_put_HZ.restype = ctypes.c_int
+        spec.Toupcam_put_HZ.errcheck = cls.__errcheck
+        spec.Toupcam_put_HZ.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_HZ.restype = ctypes.c_int
+        spec.Toupcam_get_HZ.errcheck = cls.__errcheck
+        spec.Toupcam_get_HZ.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_Mode.restype = ctypes.c_int
+        spec.Toupcam_put_Mode.errcheck = cls.__errcheck
+        spec.Toupcam_put_Mode.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_Mode.restype = ctypes.c_int
+        spec.Toupcam_get_Mode.errcheck = cls.__errcheck
+        spec.Toupcam_get_Mode.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_AWBAuxRect.restype = ctypes.c_int
+        spec.Toupcam_put_AWBAuxRect.errcheck = cls.__errcheck
+        spec.Toupcam_put_AWBAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
+        spec.Toupcam_get_AWBAuxRect.restype = ctypes.c_int
+        spec.Toupcam_get_AWBAuxRect.errcheck = cls.__errcheck
+        spec.Toupcam_get_AWBAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
+        spec.Toupcam_put_AEAuxRect.restype = ctypes.c_int
+        spec.Toupcam_put_AEAuxRect.errcheck = cls.__errcheck
+        spec.Toupcam_put_AEAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
+        spec.Toupcam_get_AEAuxRect.restype = ctypes.c_int
+        spec.Toupcam_get_AEAuxRect.errcheck = cls.__errcheck
+        spec.Toupcam_get_AEAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
+        spec.Toupcam_put_ABBAuxRect.restype = ctypes.c_int
+        spec.Toupcam_put_ABBAuxRect.errcheck = cls.__errcheck
+        spec.Toupcam_put_ABBAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
+        spec.Toupcam_get_ABBAuxRect.restype = ctypes.c_int
+        spec.Toupcam_get_ABBAuxRect.errcheck = cls.__errcheck
+        spec.Toupcam_get_ABBAuxRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__RECT)]
+        spec.Toupcam_get_MonoMode.restype = ctypes.c_int
+        spec.Toupcam_get_MonoMode.errcheck = cls.__errcheck
+        spec.Toupcam_get_MonoMode.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_get_StillResolutionNumber.restype = ctypes.c_int
+        spec.Toupcam_get_StillResolutionNumber.errcheck = cls.__errcheck
+        spec.Toupcam_get_StillResolutionNumber.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_get_StillResolution.restype = ctypes.c_int
+        spec.Toupcam_get_StillResolution.errcheck = cls.__errcheck
+        spec.Toupcam_get_StillResolution.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_RealTime.restype = ctypes.c_int
+        spec.Toupcam_put_RealTime.errcheck = cls.__errcheck
+        spec.Toupcam_put_RealTime.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        spec.Toupcam_get_RealTime.restype = ctypes.c_int
+        spec.Toupcam_get_RealTime.errcheck = cls.__errcheck
+        spec.Toupcam_get_RealTime.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_Flush.restype = ctypes.c_int
+        spec.Toupcam_Flush.errcheck = cls.__errcheck
+        spec.Toupcam_Flush.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_put_Temperature.restype = ctypes.c_int
+        spec.Toupcam_put_Temperature.errcheck = cls.__errcheck
+        spec.Toupcam_put_Temperature.argtypes = [ctypes.c_void_p, ctypes.c_ushort]
+        spec.Toupcam_get_Temperature.restype = ctypes.c_int
+        spec.Toupcam_get_Temperature.errcheck = cls.__errcheck
+        spec.Toupcam_get_Temperature.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort)]
+        spec.Toupcam_get_Revision.restype = ctypes.c_int
+        spec.Toupcam_get_Revision.errcheck = cls.__errcheck
+        spec.Toupcam_get_Revision.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort)]
+        spec.Toupcam_get_SerialNumber.restype = ctypes.c_int
+        spec.Toupcam_get_SerialNumber.errcheck = cls.__errcheck
+        spec.Toupcam_get_SerialNumber.argtypes = [ctypes.c_void_p, ctypes.c_char * 32]
+        spec.Toupcam_get_FwVersion.restype = ctypes.c_int
+        spec.Toupcam_get_FwVersion.errcheck = cls.__errcheck
+        spec.Toupcam_get_FwVersion.argtypes = [ctypes.c_void_p, ctypes.c_char * 16]
+        spec.Toupcam_get_HwVersion.restype = ctypes.c_int
+        spec.Toupcam_get_HwVersion.errcheck = cls.__errcheck
+        spec.Toupcam_get_HwVersion.argtypes = [ctypes.c_void_p, ctypes.c_char * 16]
+        spec.Toupcam_get_ProductionDate.restype = ctypes.c_int
+        spec.Toupcam_get_ProductionDate.errcheck = cls.__errcheck
+        spec.Toupcam_get_ProductionDate.argtypes = [ctypes.c_void_p, ctypes.c_char * 16]
+        spec.Toupcam_get_FpgaVersion.restype = ctypes.c_int
+        spec.Toupcam_get_FpgaVersion.errcheck = cls.__errcheck
+        spec.Toupcam_get_FpgaVersion.argtypes = [ctypes.c_void_p, ctypes.c_char * 16]
+        spec.Toupcam_get_PixelSize.restype = ctypes.c_int
+        spec.Toupcam_get_PixelSize.errcheck = cls.__errcheck
+        spec.Toupcam_get_PixelSize.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_float), ctypes.POINTER(ctypes.c_float)]
+        spec.Toupcam_put_LevelRange.restype = ctypes.c_int
+        spec.Toupcam_put_LevelRange.errcheck = cls.__errcheck
+        spec.Toupcam_put_LevelRange.argtypes = [ctypes.c_void_p, (ctypes.c_ushort * 4), (ctypes.c_ushort * 4)]
+        spec.Toupcam_get_LevelRange.restype = ctypes.c_int
+        spec.Toupcam_get_LevelRange.errcheck = cls.__errcheck
+        spec.Toupcam_get_LevelRange.argtypes = [ctypes.c_void_p, (ctypes.c_ushort * 4), (ctypes.c_ushort * 4)]
+        spec.Toupcam_put_LevelRangeV2.restype = ctypes.c_int
+        spec.Toupcam_put_LevelRangeV2.errcheck = cls.__errcheck
+        spec.Toupcam_put_LevelRangeV2.argtypes = [ctypes.c_void_p, ctypes.c_ushort, ctypes.POINTER(cls.__RECT), (ctypes.c_ushort * 4), (ctypes.c_ushort * 4)]
+        spec.Toupcam_get_LevelRangeV2.restype = ctypes.c_int
+        spec.Toupcam_get_LevelRangeV2.errcheck = cls.__errcheck
+        spec.Toupcam_get_LevelRangeV2.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort), ctypes.POINTER(cls.__RECT), (ctypes.c_ushort * 4), (ctypes.c_ushort * 4)]
+        spec.Toupcam_LevelRangeAuto.restype = ctypes.c_int
+        spec.Toupcam_LevelRangeAuto.errcheck = cls.__errcheck
+        spec.Toupcam_LevelRangeAuto.argtypes = [ctypes.c_void_p]
+        spec.Toupcam_put_LEDState.restype = ctypes.c_int
+        spec.Toupcam_put_LEDState.errcheck = cls.__errcheck
+        spec.Toupcam_put_LEDState.argtypes = [ctypes.c_void_p, ctypes.c_ushort, ctypes.c_ushort, ctypes.c_ushort, ctypes.c_ushort]
+        spec.Toupcam_write_EEPROM.restype = ctypes.c_int
+        spec.Toupcam_write_EEPROM.errcheck = cls.__errcheck
+        spec.Toupcam_write_EEPROM.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_char_p, ctypes.c_uint]
+        spec.Toupcam_read_EEPROM.restype = ctypes.c_int
+        spec.Toupcam_read_EEPROM.errcheck = cls.__errcheck
+        spec.Toupcam_read_EEPROM.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_char_p, ctypes.c_uint]
+        spec.Toupcam_read_Pipe.restype = ctypes.c_int
+        spec.Toupcam_read_Pipe.errcheck = cls.__errcheck
+        spec.Toupcam_read_Pipe.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_char_p, ctypes.c_uint]
+        spec.Toupcam_write_Pipe.restype = ctypes.c_int
+        spec.Toupcam_write_Pipe.errcheck = cls.__errcheck
+        spec.Toupcam_write_Pipe.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_char_p, ctypes.c_uint]
+        spec.Toupcam_feed_Pipe.restype = ctypes.c_int
+        spec.Toupcam_feed_Pipe.errcheck = cls.__errcheck
+        spec.Toupcam_feed_Pipe.argtypes = [ctypes.c_void_p, ctypes.c_uint]
+        spec.Toupcam_put_Option.restype = ctypes.c_int
+        spec.Toupcam_put_Option.errcheck = cls.__errcheck
+        spec.Toupcam_put_Option.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
+        spec.Toupcam_get_Option.restype = ctypes.c_int
+        spec.Toupcam_get_Option.errcheck = cls.__errcheck
+        spec.Toupcam_get_Option.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_put_Roi.restype = ctypes.c_int
+        spec.Toupcam_put_Roi.errcheck = cls.__errcheck
+        spec.Toupcam_put_Roi.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint, ctypes.c_uint, ctypes.c_uint]
+        spec.Toupcam_get_Roi.restype = ctypes.c_int
+        spec.Toupcam_get_Roi.errcheck = cls.__errcheck
+        spec.Toupcam_get_Roi.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint)]
+        spec.Toupcam_get_AfParam.restype = ctypes.c_int
+        spec.Toupcam_get_AfParam.errcheck = cls.__errcheck
+        spec.Toupcam_get_AfParam.argtypes = [ctypes.c_void_p, ctypes.POINTER(cls.__AfParam)]
+        spec.Toupcam_IoControl.restype = ctypes.c_int
+        spec.Toupcam_IoControl.errcheck = cls.__errcheck
+        spec.Toupcam_IoControl.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
+        spec.Toupcam_read_UART.restype = ctypes.c_int
+        spec.Toupcam_read_UART.errcheck = cls.__errcheck
+        spec.Toupcam_read_UART.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint]
+        spec.Toupcam_write_UART.restype = ctypes.c_int
+        spec.Toupcam_write_UART.errcheck = cls.__errcheck
+        spec.Toupcam_write_UART.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint]
+        spec.Toupcam_put_Linear.restype = ctypes.c_int
+        spec.Toupcam_put_Linear.errcheck = cls.__errcheck
+        spec.Toupcam_put_Linear.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ushort)]
+        spec.Toupcam_put_Curve.restype = ctypes.c_int
+        spec.Toupcam_put_Curve.errcheck = cls.__errcheck
+        spec.Toupcam_put_Curve.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ushort)]
+        spec.Toupcam_put_ColorMatrix.restype = ctypes.c_int
+        spec.Toupcam_put_ColorMatrix.errcheck = cls.__errcheck
+        spec.Toupcam_put_ColorMatrix.argtypes = [ctypes.c_void_p, ctypes.c_double * 9]
+        spec.Toupcam_put_InitWBGain.restype = ctypes.c_int
+        spec.Toupcam_put_InitWBGain.errcheck = cls.__errcheck
+        spec.Toupcam_put_InitWBGain.argtypes = [ctypes.c_void_p, ctypes.c_ushort * 3]
+        spec.Toupcam_get_FrameRate.restype = ctypes.c_int
+        spec.Toupcam_get_FrameRate.errcheck = cls.__errcheck
+        spec.Toupcam_get_FrameRate.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint)]
+        if sys.platform != 'win32':
+            spec.Toupcam_HotPlug.restype = None
+            spec.Toupcam_HotPlug.argtypes = [cls.__HOTPLUG_CALLBACK, ctypes.c_void_p]
+        return spec
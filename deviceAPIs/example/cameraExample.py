@@ -30,7 +30,8 @@ class MainWin(QWidget):
         self.layout.addWidget(self.widget)
         # self.layout.addWidget(self.image_label2)
         self.setLayout(self.layout)
-        self.camera.signal_image.connect(lambda idx, image: self.update_image(idx, image))
+        # the preview stream is already scaled to the window, signal_image keeps the full resolution frames
+        self.camera.signal_preview.connect(lambda idx, image: self.update_image(idx, image))
 
         self.show_camera_list()
 
@@ -45,12 +46,19 @@ class MainWin(QWidget):
 
     def connect_to_camera(self, idx):
         self.camera.connect_to_camera(idx)
+        self.camera.enable_preview(0, self.geometry().width(), self.geometry().height(), fps=30)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.camera.previewers:
+            self.camera.enable_preview(0, event.size().width(), event.size().height())
 
     @Slot(int, np.ndarray)
     def update_image(self, idx, image):
         if image is not None:
             # NumPy 배열을 QImage로 변환
-            qimage = QImage(image.data, image.shape[1], image.shape[0], (image.shape[1] * 24 + 31) // 32 * 4, QImage.Format_RGB888)
+            image_format = QImage.Format_Grayscale8 if image.ndim == 2 else QImage.Format_RGB888
+            qimage = QImage(image.data, image.shape[1], image.shape[0], image.strides[0], image_format)
             pixmap = QPixmap.fromImage(qimage)
 
             # 이미지 표시
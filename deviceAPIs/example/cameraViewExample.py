@@ -0,0 +1,46 @@
+import sys
+
+from PySide6.QtWidgets import QApplication, QHBoxLayout, QWidget
+from deviceAPIs.camera import Camera
+from deviceAPIs.camera.CameraView import CameraView
+
+
+class MainWin(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.camera = Camera()
+        self.resize(800, 600)
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle("Camera Viewer")
+        # frames are drawn at their own bit depth, the histogram adjusts the display levels
+        self.view = CameraView(self, histogram=True, fps=30)
+
+        self.layout = QHBoxLayout()
+        self.layout.addWidget(self.view)
+        self.setLayout(self.layout)
+
+        self.show_camera_list()
+
+    def show_camera_list(self):
+        camera_list = self.camera.get_available_camera_list()
+        print(f"camera_list: {camera_list}")
+
+        if len(camera_list) == 0:
+            return
+        self.camera.connect_to_camera(camera_list[0])
+        self.view.attach(self.camera, 0)
+
+    def closeEvent(self, event):
+        self.view.detach()
+        if self.camera.using_cameras and self.camera.using_cameras[0] is not None:
+            self.camera.disconnect_to_camera(0)
+        super().closeEvent(event)
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    win = MainWin()
+    win.show()
+    sys.exit(app.exec())
@@ -0,0 +1,316 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+TAG = "mosaic"
+
+
+def planTiles(x, y, cols, rows, stepX, stepY):
+    """
+    지그재그(serpentine) 순서의 타일 목록을 만듭니다. 연속한 두 타일은 항상 이웃합니다.
+
+    :return: [(row, col, x 위치, y 위치), ...]
+    """
+    tiles = []
+    for row in range(rows):
+        order = range(cols) if row % 2 == 0 else range(cols - 1, -1, -1)
+        for col in order:
+            tiles.append((row, col, x + col * stepX, y + row * stepY))
+    return tiles
+
+
+def toGray(image):
+    if image.ndim == 3:
+        image = image.mean(axis=2)
+    return np.asarray(image, dtype=np.float32)
+
+
+def phaseCorrelation(reference, image):
+    """
+    image 를 reference 에 맞추기 위한 (dy, dx) 이동량과 상관 피크 값을 구합니다.
+    이동량은 이미지 크기의 주기로만 결정되므로 -size/2 ~ size/2 범위로 돌려줍니다.
+    """
+    window = np.outer(np.hanning(reference.shape[0]), np.hanning(reference.shape[1])).astype(np.float32)
+    f1 = np.fft.rfft2((reference - reference.mean()) * window)
+    f2 = np.fft.rfft2((image - image.mean()) * window)
+    cross = f1 * np.conj(f2)
+    cross /= np.abs(cross) + 1e-12
+    correlation = np.fft.irfft2(cross, s=reference.shape)
+    peak = np.unravel_index(np.argmax(correlation), correlation.shape)
+    shift = [p if p <= n // 2 else p - n for p, n in zip(peak, correlation.shape)]
+    return shift[0], shift[1], float(correlation[peak])
+
+
+def registerTile(reference, image, expected, maxCorrection, minPeak=0.1):
+    """
+    이웃 타일 reference 기준 image 의 위치 (dy, dx) 를 구합니다. 프로세스 풀에서 실행됩니다.
+    예상 위치로 겹치는 영역을 잘라 그 영역끼리만 위상 상관을 구합니다.
+
+    :param expected: 스테이지 위치로 계산한 예상 위치 (dy, dx) 픽셀
+    :param maxCorrection: 예상 위치에서 허용할 최대 보정량 (픽셀), 넘으면 예상 위치를 사용
+    :param minPeak: 정합으로 인정할 최소 상관 피크 값, 특징이 없는 겹침 영역은 예상 위치를 사용
+    :return: ((dy, dx), 상관 피크 값, 정합 성공 여부)
+    """
+    ey, ex = (int(round(e)) for e in expected)
+    (rh, rw), (ih, iw) = reference.shape, image.shape
+    overlap = (slice(max(ey, 0), min(rh, ey + ih)), slice(max(ex, 0), min(rw, ex + iw)))
+    moved = (slice(max(-ey, 0), min(ih, rh - ey)), slice(max(-ex, 0), min(iw, rw - ex)))
+    referencePatch, imagePatch = reference[overlap], image[moved]
+    if min(referencePatch.shape) < 16:
+        return (ey, ex), 0.0, False
+    sy, sx, peak = phaseCorrelation(referencePatch, imagePatch)
+    # 겹친 영역에서 image 를 (sy, sx) 만큼 옮겨야 reference 와 맞으므로 타일 위치도 그만큼 보정됩니다.
+    dy, dx = ey + int(sy), ex + int(sx)
+    if peak < minPeak or abs(sy) > maxCorrection or abs(sx) > maxCorrection:
+        return (ey, ex), peak, False
+    return (dy, dx), peak, True
+
+
+def cropOverlap(reference, image, expected, margin):
+    """
+    프로세스 풀로 넘길 데이터를 줄이기 위해 예상 겹침 영역에 margin 을 더한 부분만 잘라냅니다.
+
+    :return: (reference 조각, image 조각, 조각 기준 예상 위치, 조각 기준 위치를 원래 위치로 바꿀 때 더할 값)
+    """
+    ey, ex = (int(round(e)) for e in expected)
+    bounds = []
+    for e, referenceSize, imageSize in ((ey, reference.shape[0], image.shape[0]), (ex, reference.shape[1], image.shape[1])):
+        r0, r1 = max(e - margin, 0), min(e + imageSize + margin, referenceSize)
+        i0, i1 = max(-e - margin, 0), min(referenceSize - e + margin, imageSize)
+        bounds.append((r0, max(r1, r0), i0, max(i1, i0)))
+    (ry0, ry1, iy0, iy1), (rx0, rx1, ix0, ix1) = bounds
+    offset = (ry0 - iy0, rx0 - ix0)
+    referenceStrip = np.ascontiguousarray(reference[ry0:ry1, rx0:rx1])
+    imageStrip = np.ascontiguousarray(image[iy0:iy1, ix0:ix1])
+    return referenceStrip, imageStrip, (ey - offset[0], ex - offset[1]), offset
+
+
+class Mosaic(QObject):
+    tileCapturedSignal = Signal(int, int)  # row, col
+    tileStitchedSignal = Signal(int, int, int, int)  # row, col, 캔버스 위 y, x
+    finishedSignal = Signal(str)  # 캔버스 파일 경로
+    errorSignal = Signal(str)
+
+    _registeredSignal = Signal(int, object)  # 타일 번호, registerTile 결과 (프로세스 풀 스레드 -> Qt 스레드)
+
+    def __init__(self, stage, camera, xIdx=0, yIdx=1, cameraIdx=0, maxWorkers=2):
+        """
+
+        :param stage: deviceAPIs.v2.Stage
+        :param camera: deviceAPIs.camera.Camera
+        :param xIdx: X축 스테이지 번호 (영상의 열 방향)
+        :param yIdx: Y축 스테이지 번호 (영상의 행 방향)
+        :param cameraIdx: 타일을 촬영할 카메라 번호
+        :param maxWorkers: 타일 정합에 사용할 프로세스 수
+        """
+        super().__init__()
+        self.stage = stage
+        self.camera = camera
+        self.xIdx = xIdx
+        self.yIdx = yIdx
+        self.cameraIdx = cameraIdx
+        self.maxWorkers = maxWorkers
+
+        self.settleTime = 0.1
+        self.timeout = 10000
+        self.isRunning = False
+        self.tiles = []
+        self.canvas = None
+        self.path = None
+        self.placements = {}  # 타일 번호: 캔버스 위 (y, x)
+
+        self._executor = None
+        self._capturing = False
+        self._index = -1
+        self._pendingAxes = set()
+        self._settledAt = None
+        self._images = {}  # 정합을 기다리는 타일 번호: 원본 영상
+        self._grays = {}
+        self._results = {}
+        self._offsets = {}  # 타일 번호: 잘라낸 띠 기준 위치에 더할 값
+        self._nextPlacement = 0
+
+        self._registeredSignal.connect(self.onRegistered)
+        self.timeoutTimer = QTimer()
+        self.timeoutTimer.setSingleShot(True)
+        self.timeoutTimer.timeout.connect(self.onTimeout)
+
+    def start(self, path, x, y, cols, rows, stepX, stepY, pixelSize, settleTime=0.1, maxCorrection=None,
+              minPeak=0.1):
+        """
+        (x, y) 에서 시작하는 cols x rows 타일을 촬영하고 path 의 메모리 맵 캔버스에 이어 붙입니다.
+
+        :param path: 캔버스를 저장할 raw 파일 경로
+        :param stepX: 타일 간 X 간격 (스테이지 단위), 영상 폭보다 작게 두어 겹치도록 합니다.
+        :param stepY: 타일 간 Y 간격 (스테이지 단위)
+        :param pixelSize: 영상 한 픽셀에 해당하는 스테이지 이동량
+        :param settleTime: 스테이지 이동 완료 후 기다릴 시간 (초)
+        :param maxCorrection: 정합 보정 한도 (픽셀), None 이면 이동량의 1/4
+        :param minPeak: 정합으로 인정할 최소 위상 상관 피크 값 (0 ~ 1), 낮으면 스테이지 위치를 그대로 사용
+        """
+        if self.isRunning:
+            return
+        self.path = path
+        self.settleTime = settleTime
+        self.tiles = planTiles(x, y, cols, rows, stepX, stepY)
+        self.pixelSize = pixelSize
+        self.stepPixels = (abs(stepY) / pixelSize, abs(stepX) / pixelSize)
+        self.maxCorrection = maxCorrection if maxCorrection is not None else max(self.stepPixels) / 4
+        self.minPeak = minPeak
+        self.canvas = None
+        self.placements = {}
+        self._images = {}
+        self._grays = {}
+        self._results = {}
+        self._offsets = {}  # 타일 번호: 잘라낸 띠 기준 위치에 더할 값
+        self._nextPlacement = 0
+        self._index = -1
+        self.isRunning = True
+
+        self._executor = ProcessPoolExecutor(max_workers=self.maxWorkers)
+        self._capturing = True
+        self.camera.signal_frame.connect(self.onFrame)
+        self.stage.movedSignal.connect(self.onMoved)
+        self.nextTile()
+
+    def stop(self):
+        if not self.isRunning:
+            return
+        self.isRunning = False
+        self.stopCapture()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        if self.canvas is not None:
+            self.canvas.flush()
+
+    def stopCapture(self):
+        self.timeoutTimer.stop()
+        if not self._capturing:
+            return
+        self._capturing = False
+        self.camera.signal_frame.disconnect(self.onFrame)
+        self.stage.movedSignal.disconnect(self.onMoved)
+
+    def nextTile(self):
+        self._index += 1
+        if self._index >= len(self.tiles):
+            # 촬영은 끝났고, 남은 정합 결과는 onRegistered 에서 마무리합니다.
+            self.stopCapture()
+            return
+        row, col, x, y = self.tiles[self._index]
+        self._settledAt = None
+        self._pendingAxes = {self.xIdx, self.yIdx}
+        self.timeoutTimer.start(self.timeout)
+        self.stage.move(self.xIdx, x)
+        self.stage.move(self.yIdx, y)
+
+    @Slot(int, float)
+    def onMoved(self, idx, position):
+        if idx not in self._pendingAxes:
+            return
+        self._pendingAxes.discard(idx)
+        if not self._pendingAxes:
+            self._settledAt = time.monotonic() + self.settleTime
+
+    @Slot(int, object)
+    def onFrame(self, idx, frame):
+        if idx != self.cameraIdx or self._settledAt is None or frame.host_timestamp < self._settledAt:
+            return
+        self._settledAt = None
+        self.timeoutTimer.stop()
+        index = self._index
+        row, col, _, _ = self.tiles[index]
+        # 카메라 버퍼는 곧 재사용되므로 복사해 둡니다.
+        self._images[index] = np.array(frame.image, copy=True)
+        self._grays[index] = toGray(frame.image)
+        self.tileCapturedSignal.emit(row, col)
+
+        if index == 0:
+            self._results[0] = ((0, 0), 0.0, True)
+            self.placeTiles()
+        else:
+            _, _, px, py = self.tiles[index - 1]
+            _, _, x, y = self.tiles[index]
+            expected = ((y - py) / self.pixelSize, (x - px) / self.pixelSize)
+            # 전체 타일 대신 겹치는 띠만 프로세스 풀로 넘깁니다.
+            referenceStrip, imageStrip, stripExpected, self._offsets[index] = cropOverlap(
+                self._grays[index - 1], self._grays[index], expected, int(np.ceil(self.maxCorrection)))
+            future = self._executor.submit(registerTile, referenceStrip, imageStrip, stripExpected,
+                                           self.maxCorrection, self.minPeak)
+            future.add_done_callback(lambda f: self._registeredSignal.emit(index, f))
+        self.nextTile()
+
+    @Slot(int, object)
+    def onRegistered(self, index, future):
+        if not self.isRunning or future.cancelled():
+            return
+        oy, ox = self._offsets.pop(index)
+        try:
+            (dy, dx), peak, registered = future.result()
+            self._results[index] = ((dy + oy, dx + ox), peak, registered)
+        except Exception as e:
+            msg = f"{TAG} 타일 {index} 정합 실패: {e}"
+            print(msg)
+            self.errorSignal.emit(msg)
+            _, _, px, py = self.tiles[index - 1]
+            _, _, x, y = self.tiles[index]
+            self._results[index] = ((int(round((y - py) / self.pixelSize)), int(round((x - px) / self.pixelSize))),
+                                    0.0, False)
+        self.placeTiles()
+
+    def placeTiles(self):
+        # 각 타일의 위치는 이전 타일 기준이므로 촬영 순서대로 배치합니다.
+        while self._nextPlacement in self._results and self._nextPlacement in self._images:
+            index = self._nextPlacement
+            (dy, dx), _, _ = self._results.pop(index)
+            image = self._images.pop(index)
+            if index == 0:
+                self.allocateCanvas(image)
+                position = self.canvasOrigin
+            else:
+                py, px = self.placements[index - 1]
+                position = (py + dy, px + dx)
+            self.placements[index] = position
+            self.paste(image, position)
+            self._grays.pop(index - 1, None)
+
+            row, col, _, _ = self.tiles[index]
+            self.tileStitchedSignal.emit(row, col, position[0], position[1])
+            self._nextPlacement += 1
+
+        if self._nextPlacement == len(self.tiles):
+            self._grays.clear()
+            self.stop()
+            self.finishedSignal.emit(self.path)
+
+    def allocateCanvas(self, image):
+        """촬영 범위에 정합 보정 여유를 더한 크기의 캔버스를 만듭니다."""
+        ys = [t[3] for t in self.tiles]
+        xs = [t[2] for t in self.tiles]
+        margin = int(np.ceil(self.maxCorrection)) * 2 + 1
+        spanY = int(np.ceil((max(ys) - min(ys)) / self.pixelSize))
+        spanX = int(np.ceil((max(xs) - min(xs)) / self.pixelSize))
+        shape = (spanY + image.shape[0] + 2 * margin, spanX + image.shape[1] + 2 * margin) + image.shape[2:]
+        self.canvas = np.memmap(self.path, dtype=image.dtype, mode="w+", shape=shape)
+        y0 = int(round((self.tiles[0][3] - min(ys)) / self.pixelSize))
+        x0 = int(round((self.tiles[0][2] - min(xs)) / self.pixelSize))
+        self.canvasOrigin = (margin + y0, margin + x0)
+
+    def paste(self, image, position):
+        y, x = position
+        height, width = image.shape[:2]
+        # 보정이 누적되어 캔버스를 벗어나는 부분은 잘라냅니다.
+        top, left = max(y, 0), max(x, 0)
+        bottom, right = min(y + height, self.canvas.shape[0]), min(x + width, self.canvas.shape[1])
+        if top >= bottom or left >= right:
+            return
+        self.canvas[top:bottom, left:right] = image[top - y:bottom - y, left - x:right - x]
+
+    @Slot()
+    def onTimeout(self):
+        msg = f"{TAG} 타일 {self._index} 을(를) 촬영하지 못했습니다."
+        print(msg)
+        self.stop()
+        self.errorSignal.emit(msg)
@@ -1,65 +1,270 @@
+import threading
+import time
+from functools import lru_cache
+
 import numpy as np
 import seatease.spectrometers as st
 import seabreeze.spectrometers as sb
-from PySide6.QtCore import QThread, QTimer, Signal, Slot
+from PySide6.QtCore import QThread, Signal, Slot
+from scipy.signal import savgol_coeffs
+
+# (장치 시리얼, 레이저 파장): 라만 시프트 축, 장치의 파장 축은 바뀌지 않으므로 한 번만 계산합니다.
+ramanAxisCache = {}
+
+
+def ramanShift(wavelengths, laserWavelength):
+    """
+    :param wavelengths: 파장 (nm)
+    :param laserWavelength: 레이저 파장 (nm)
+    :return: 라만 시프트 (cm^-1)
+    """
+    return (1 / laserWavelength - 1 / np.asarray(wavelengths, dtype=np.float64)) * (10 ** 7)
+
+
+class Smoothing:
+    NONE = 0
+    BOXCAR = 1
+    SAVITZKY_GOLAY = 2
+
+    @classmethod
+    def get_name(cls, code):
+        smoothing_dict = {
+            cls.NONE: "NONE",
+            cls.BOXCAR: "BOXCAR",
+            cls.SAVITZKY_GOLAY: "SAVITZKY_GOLAY",
+        }
+        return smoothing_dict.get(code, "UNKNOWN")
+
+
+@lru_cache(maxsize=None)
+def smoothingKernel(method, window, polyorder=2):
+    """np.convolve 에 사용할 스무딩 계수, (방법, 창 크기, 차수) 별로 한 번만 계산합니다."""
+    if method == Smoothing.BOXCAR:
+        kernel = np.full(window, 1 / window)
+    else:
+        kernel = savgol_coeffs(window, polyorder, use="conv")
+    kernel.setflags(write=False)
+    return kernel
 
 
 class Spectrometer(QThread):
     isConnected = False
+    minBackoff = 0.1  # 측정 실패 후 첫 재시도까지 기다릴 시간 (초)
+    maxBackoff = 5.0
 
     limitTop = None
     limitBottom = None
 
     connectedSignal = Signal(bool)
     integrationTimeSettedSignal = Signal()
-    resGetSpectrum = Signal(np.ndarray)
+    resGetSpectrum = Signal(np.ndarray, np.ndarray)  # 라만 시프트 축 (캐시된 공유 배열), intensity
+    spectrumIndexSignal = Signal(int)  # 링 버퍼에 새로 기록된 스펙트럼 번호, getSpectrumAt 으로 조회
     ramanSignal = Signal(list)
+    errorSignal = Signal(str)  # 측정이 실패하기 시작할 때 한 번 발생
 
-    def __init__(self, isVirtual=False, integrationTime=1000000):
+    def __init__(self, isVirtual=False, integrationTime=1000000, laserWavelength=632.8, ringSize=64):
+        """
+
+        :param isVirtual: 가상 스펙트로미터(seatease) 사용 여부
+        :param integrationTime: 노출 시간 (us)
+        :param laserWavelength: 라만 시프트 계산에 사용할 레이저 파장 (nm)
+        :param ringSize: 최근 스펙트럼을 보관할 링 버퍼 크기
+        """
         super().__init__()
+        self.laserWavelength = laserWavelength
+        self.ramanAxis = None
+        self.scansToAverage = 1
+        self.smoothing = (Smoothing.NONE, 1, 2)  # (방법, 창 크기, 차수)
+        self.resetAverage = False
+        self.isProcessing = False
+        self.specLock = threading.Lock()
+        self.pendingIntegrationTime = None  # 다음 노출 전에 적용할 노출 시간 (us)
+        self.pendingLock = threading.Lock()
+        self.averageLock = threading.Lock()  # scansToAverage, resetAverage 는 GUI 스레드에서도 바뀝니다.
+        self.stopEvent = threading.Event()
         try:
             self.spec = st.Spectrometer.from_first_available() if isVirtual else sb.Spectrometer.from_first_available()
-            self.timer = QTimer()
-            self.timer.timeout.connect(self.getSpectrum)
-            self.timer.start(int(integrationTime / 1000))
+            # 파장 축과 시리얼은 바뀌지 않으므로 연결할 때 한 번만 장치에서 읽습니다.
+            self.serial = self.spec.serial_number
+            self.wavelengths = np.array(self.spec.wavelengths(), dtype=np.float64)
+            self.wavelengths.setflags(write=False)
+            pixels = len(self.wavelengths)
+            # 스펙트럼은 미리 할당한 링에 기록하고, 소비자에게는 번호만 알립니다.
+            self.ring = np.zeros((ringSize, pixels), dtype=np.float64)
+            self.timestamps = np.zeros(ringSize, dtype=np.float64)
+            self.count = 0  # 지금까지 기록한 스펙트럼 수, 마지막 스펙트럼 번호는 count - 1
+            # scansToAverage 번의 스펙트럼을 더해 평균을 내고, 결과도 링에 기록합니다.
+            self.scanSum = np.zeros(pixels, dtype=np.float64)
+            self.scanCount = 0
+            self.resultRing = np.zeros((ringSize, pixels), dtype=np.float64)
+            self.resultCount = 0
             self.setIntegrationTime(integrationTime)
             self.isConnected = True
-            self.isProcessing = False
             self.connectedSignal.emit(True)
+            self.getSpectrum()
 
         except Exception as e:
             print("스펙트로미터 장치에 연결할 수 없습니다.", e)
             self.connectedSignal.emit(False)
 
     def run(self):
-        self.getSpectrumAsync()
+        # 타이머로 스레드를 다시 시작하지 않고, 멈출 때까지 노출을 연달아 읽습니다.
+        backoff = None  # 실패 중이면 다음 재시도까지 기다릴 시간 (초)
+        while not self.stopEvent.is_set():
+            try:
+                self.applyIntegrationTime()
+                self.getSpectrumAsync()
+                backoff = None
+            except Exception as e:
+                # 같은 오류가 반복되면 출력하지 않고, 재시도 간격을 maxBackoff 까지 늘립니다.
+                if backoff is None:
+                    msg = f"스펙트럼을 읽을 수 없습니다. {e}"
+                    print(msg)
+                    self.errorSignal.emit(msg)
+                    backoff = self.minBackoff
+                else:
+                    backoff = min(backoff * 2, self.maxBackoff)
+                self.stopEvent.wait(backoff)
 
     def close(self):
+        self.stopGetSpectrum()
         self.spec.close()
 
     def setIntegrationTime(self, value):
-        self.spec.integration_time_micros(value)
+        """
+        측정 중이면 값만 저장하고 바로 돌아오며, 진행 중인 노출이 끝난 뒤 측정 스레드에서 적용됩니다.
+        적용되면 integrationTimeSettedSignal 이 발생합니다.
+        """
+        with self.pendingLock:
+            self.pendingIntegrationTime = value
+        if not self.isRunning():
+            self.applyIntegrationTime()
+
+    def applyIntegrationTime(self):
+        with self.pendingLock:
+            value, self.pendingIntegrationTime = self.pendingIntegrationTime, None
+        if value is None:
+            return
+        with self.specLock:
+            self.spec.integration_time_micros(value)
         self.integrationTimeSettedSignal.emit()
-        self.timer.stop()
-        self.timer.setInterval(value / 1000)
-        self.timer.start()
 
     @Slot()
     def getSpectrum(self):
+        """연속 측정을 시작합니다. 이미 측정 중이면 아무것도 하지 않습니다."""
+        if self.isRunning():
+            return
+        self.stopEvent.clear()
         self.start()
 
     def getSpectrumAsync(self):
         self.isProcessing = True
-        info = self.spec.spectrum()
+        with self.specLock:
+            intensities = self.spec.intensities()
+        timestamp = time.monotonic()
         self.isProcessing = False
 
-        laserWavelength = 632.8
-        ramanShift = (1 / laserWavelength - 1 / info[0]) * (10 ** 7)
-        info[0] = ramanShift
-        self.resGetSpectrum.emit(info)
+        index = self.count
+        slot = index % len(self.ring)
+        self.ring[slot] = intensities
+        self.timestamps[slot] = timestamp
+        self.count = index + 1
+
+        if self.ramanAxis is None:
+            self.ramanAxis = self.getRamanAxis()
+        self.spectrumIndexSignal.emit(index)
+
+        result = self.accumulate(self.ring[slot])
+        if result is not None:
+            # 링의 행을 복사 없이 전달합니다. ringSize 번의 결과 동안 유효합니다.
+            self.resGetSpectrum.emit(self.ramanAxis, result)
+
+    def accumulate(self, intensities):
+        """
+        스펙트럼을 누적합에 더하고, scansToAverage 번째마다 평균과 스무딩을 적용한 결과 행을 돌려줍니다.
+        """
+        with self.averageLock:
+            reset, self.resetAverage = self.resetAverage, False
+            scansToAverage = self.scansToAverage
+        if reset:
+            self.scanSum.fill(0)
+            self.scanCount = 0
+        np.add(self.scanSum, intensities, out=self.scanSum)
+        self.scanCount += 1
+        if self.scanCount < scansToAverage:
+            return None
+
+        result = self.resultRing[self.resultCount % len(self.resultRing)]
+        np.divide(self.scanSum, self.scanCount, out=result)
+        self.scanSum.fill(0)
+        self.scanCount = 0
+        self.resultCount += 1
+
+        method, window, polyorder = self.smoothing
+        if method != Smoothing.NONE and window > 1:
+            kernel = smoothingKernel(method, window, polyorder)
+            half = window // 2
+            # 양 끝은 반사해서 이어 붙인 뒤 계산해 스펙트럼 길이를 유지합니다.
+            padded = np.pad(result, half, mode="reflect")
+            result[:] = np.convolve(padded, kernel, mode="valid")
+        return result
+
+    def setAveraging(self, scans):
+        """
+        :param scans: 평균낼 스펙트럼 수, resGetSpectrum 은 scans 번의 측정마다 한 번 방출됩니다.
+        """
+        with self.averageLock:
+            self.scansToAverage = max(int(scans), 1)
+            self.resetAverage = True
+
+    def setSmoothing(self, method, window=5, polyorder=2):
+        """
+        :param method: Smoothing.NONE, BOXCAR, SAVITZKY_GOLAY
+        :param window: 창 크기 (홀수)
+        :param polyorder: Savitzky-Golay 다항식 차수 (window 보다 작아야 함)
+        """
+        if window % 2 == 0:
+            window += 1
+        if method == Smoothing.SAVITZKY_GOLAY and polyorder >= window:
+            raise ValueError(f"polyorder({polyorder}) 는 window({window}) 보다 작아야 합니다.")
+        if method != Smoothing.NONE:
+            # 계수를 여기서 미리 계산해 측정 스레드가 기다리지 않도록 합니다.
+            smoothingKernel(method, window, polyorder)
+        self.smoothing = (method, window, polyorder)
+
+    def getSpectrumAt(self, index):
+        """
+        :param index: spectrumIndexSignal 로 받은 스펙트럼 번호
+        :return: (timestamp, intensity) 또는 링에서 이미 덮어쓴 경우 None
+        """
+        if index < 0 or index >= self.count or self.count - index > len(self.ring):
+            return None
+        slot = index % len(self.ring)
+        return self.timestamps[slot], self.ring[slot]
+
+    def getRamanAxis(self, laserWavelength=None):
+        """
+        장치의 파장 축을 라만 시프트로 바꾼 축을 돌려줍니다. (장치, 레이저 파장) 별로 한 번만 계산하며,
+        여러 스펙트럼이 같은 배열을 공유하므로 읽기 전용입니다.
+        """
+        if laserWavelength is None:
+            laserWavelength = self.laserWavelength
+        # 측정 스레드가 장치를 쓰는 중일 수 있으므로 저장해 둔 파장 축으로만 계산합니다.
+        key = (self.serial, laserWavelength)
+        axis = ramanAxisCache.get(key)
+        if axis is None:
+            axis = ramanShift(self.wavelengths, laserWavelength)
+            axis.setflags(write=False)
+            ramanAxisCache[key] = axis
+        return axis
+
+    def setLaserWavelength(self, laserWavelength):
+        self.laserWavelength = laserWavelength
+        self.ramanAxis = self.getRamanAxis()
 
     def stopGetSpectrum(self):
-        self.timer.stop()
+        self.stopEvent.set()
+        self.wait()
 
     @Slot()
     def checkConnected(self):
@@ -67,6 +272,6 @@ class Spectrometer(QThread):
 
     @Slot(float)
     def getRamanShift(self, laserWavelength):
-        ramanShift = (1 / laserWavelength - 1 / self.getSpectrum()[0]) * (10 ** 7)
-        self.ramanSignal.emit(ramanShift)
-        return ramanShift
+        axis = self.getRamanAxis(laserWavelength)
+        self.ramanSignal.emit(axis.tolist())
+        return axis